@@ -1,50 +1,168 @@
-from flask import Flask, render_template, request, jsonify
-import requests
-from bs4 import BeautifulSoup
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
+from bs4 import BeautifulSoup, SoupStrainer
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from datetime import datetime
+import heapq
 import json
 import os
 import re
+import sys
+import threading
+import time
+
+import fight_db
+import names
+from fighter_directory import FighterDirectory
+from fuzzy_names import dice, name_similarity, trigrams
+from html_extract import extract_rows, fighters_from_rows, fights_from_rows, iter_fights
+from http_cache import ResponseCache
+import http_response
+import metrics
+from http_session import UpstreamError, UpstreamSession
+from prefetch import Prefetcher
+from single_flight import SingleFlight
 
 app = Flask(__name__)
 
+# Pages are parsed with the streaming row extractor by default. Setting
+# UFC_HTML_PARSER picks a BeautifulSoup backend instead; lxml is used for
+# that when it is installed.
+try:
+    import lxml  # noqa: F401
+    SOUP_PARSER = 'lxml'
+except ImportError:
+    SOUP_PARSER = 'html.parser'
+
+# Only build the table rows we read instead of the whole page. The strainer
+# sees the raw class attribute while parsing, so match it as a word in the
+# string rather than as one of several classes.
+SEARCH_ROWS = SoupStrainer('tr', class_=re.compile(r'(^|\s)b-statistics__table-row(\s|$)'))
+FIGHT_ROWS = SoupStrainer('tr', class_=re.compile(r'(^|\s)b-fight-details__table-row(\s|$)'))
+
+# Sent with a 502 when ufcstats.com fails, so it isn't taken for "nothing found"
+UPSTREAM_ERROR = 'UFC Stats is not responding, please try again shortly'
+
 # =============================================================================
 # Paramount+ Fight Database — maps fighter names to direct video URLs
 # =============================================================================
+class MatchIndex:
+    """One complete build of the lookup tables used by ParamountMatcher.
+    Every (re)load builds a new MatchIndex and swaps it in whole, so a
+    lookup running at the same time never sees a half-built one.
+    """
+    __slots__ = ('fights', 'entries', 'by_name', 'by_last', 'by_last_pair', 'name_trigrams',
+                 'available', 'fighter_counts')
+    # What the compiled snapshot holds; fighter_counts is cheap to recompute
+    FIELDS = __slots__[:-1]
+    
+    def __init__(self, fights=None, entries=None, by_name=None, by_last=None,
+                 by_last_pair=None, name_trigrams=None, available=None, fighter_counts=None):
+        self.fights = fights or []                 # FightRecord per video
+        self.entries = entries or []               # normalized names etc. per fight
+        self.by_name = by_name or {}               # normalized full name -> (entry index, ...)
+        self.by_last = by_last or {}               # normalized last name -> (entry index, ...)
+        self.by_last_pair = by_last_pair or {}     # sorted (last, last) -> (entry index, ...)
+        self.name_trigrams = name_trigrams or {}   # trigram -> tuple of normalized full names
+        self.available = available or {}           # pair key + event number -> URL or None
+        # normalized full name -> videos they appear in
+        self.fighter_counts = fighter_counts or {name: len(ids) for name, ids in self.by_name.items()}
+    
+    def tables(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
 class ParamountMatcher:
     """Matches UFC fights to Paramount+ video URLs using scraped data"""
     
-    def __init__(self):
-        self.fights = []
+    # Fuzzy fallback: minimum name similarity per side, and how many trigram
+    # candidates (with at least FUZZY_MIN_DICE trigram overlap) get scored
+    FUZZY_MIN_SIMILARITY = 0.9
+    FUZZY_CANDIDATES = 6
+    FUZZY_MIN_DICE = 0.35
+    
+    def __init__(self, db_path=None, use_compiled=True):
+        self.db_path = db_path or os.path.join(os.path.dirname(__file__), 'paramount_fights.json')
+        self.use_compiled = use_compiled
+        self.index = MatchIndex()
+        self.stamp = None
+        self.reload_lock = threading.Lock()
         self.load_database()
     
+    @property
+    def fights(self):
+        return self.index.fights
+    
     def load_database(self):
-        """Load the scraped Paramount+ fight database"""
-        db_path = os.path.join(os.path.dirname(__file__), 'paramount_fights.json')
-        if os.path.exists(db_path):
-            with open(db_path, 'r', encoding='utf-8') as f:
-                self.fights = json.load(f)
-            # Filter out entries without fighter names
-            self.fights = [f for f in self.fights if f.get('fighter1') and f.get('fighter2')]
-            print(f"Loaded {len(self.fights)} Paramount+ fight links")
-        else:
+        """Load the scraped Paramount+ fight database.
+        Uses the compiled snapshot when it matches the JSON file, otherwise
+        parses the JSON, builds the index and refreshes the snapshot.
+        """
+        if not os.path.exists(self.db_path):
             print("WARNING: paramount_fights.json not found! Run scrape_paramount.py first.")
+            return
+        
+        stamp = fight_db.source_stamp(self.db_path)
+        tables = fight_db.load(fight_db.compiled_path(self.db_path), stamp) if self.use_compiled else None
+        if tables:
+            self.index = MatchIndex(**tables)
+        else:
+            self.index = self.build_index(fight_db.read_json(self.db_path))
+            if self.use_compiled:
+                self.save_compiled(stamp)
+        self.stamp = stamp
+        print(f"Loaded {len(self.fights)} Paramount+ fight links")
     
-    @staticmethod
-    def normalize(name):
-        """Normalize a name for matching — lowercase, strip accents/punctuation"""
-        name = name.lower().strip()
-        # Remove common accent characters
-        replacements = {'é': 'e', 'è': 'e', 'ê': 'e', 'ë': 'e',
-                        'á': 'a', 'à': 'a', 'â': 'a', 'ã': 'a',
-                        'í': 'i', 'ì': 'i', 'î': 'i', 'ï': 'i',
-                        'ó': 'o', 'ò': 'o', 'ô': 'o', 'õ': 'o',
-                        'ú': 'u', 'ù': 'u', 'û': 'u', 'ü': 'u',
-                        'ñ': 'n', 'ç': 'c', 'ø': 'o', 'š': 's', 'ž': 'z'}
-        for k, v in replacements.items():
-            name = name.replace(k, v)
-        # Remove non-alphanumeric (keep spaces)
-        name = re.sub(r'[^a-z0-9 ]', '', name)
-        return name
+    def reload_if_changed(self):
+        """Rebuild the index if paramount_fights.json changed since it was loaded.
+        Only added or changed fights are normalized again. Returns True if a
+        new index was swapped in.
+        """
+        with self.reload_lock:
+            try:
+                stamp = fight_db.source_stamp(self.db_path)
+            except OSError:
+                return False
+            if stamp == self.stamp:
+                return False
+            
+            try:
+                fights = fight_db.read_json(self.db_path)
+            except (OSError, ValueError) as e:
+                # Most likely caught mid-write; the next poll will try again
+                print(f"Not reloading Paramount+ database yet: {e}")
+                return False
+            
+            self.index = self.build_index(fights, previous=self.index)
+            self.stamp = stamp
+            if self.use_compiled:
+                self.save_compiled(stamp)
+            print(f"Reloaded {len(fights)} Paramount+ fight links")
+            return True
+    
+    def start_watching(self, interval=10):
+        """Poll paramount_fights.json every interval seconds and hot-reload it"""
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.reload_if_changed()
+                except Exception as e:
+                    print(f"Error reloading Paramount+ database: {e}")
+        
+        thread = threading.Thread(target=run, name='paramount-reload', daemon=True)
+        thread.start()
+        return thread
+    
+    def save_compiled(self, stamp=None):
+        """Write the current index to the compiled snapshot file"""
+        stamp = stamp or fight_db.source_stamp(self.db_path)
+        try:
+            fight_db.save(fight_db.compiled_path(self.db_path), stamp, self.index.tables())
+        except OSError as e:
+            print(f"Could not save compiled fight database: {e}")
+    
+    # Memoized and shared with the fighter directory (see names.py)
+    normalize = staticmethod(names.normalize)
     
     @staticmethod
     def get_last_name(full_name):
@@ -52,35 +170,342 @@ class ParamountMatcher:
         parts = full_name.strip().split()
         return parts[-1] if parts else ''
     
+    @staticmethod
+    def first_names(full_name, last_name):
+        """Everything before the last name in a normalized full name"""
+        if full_name.endswith(' ' + last_name):
+            return full_name[:-len(last_name)].strip()
+        return ''
+    
     @staticmethod
     def extract_event_number(event_name):
         """Extract UFC event number from event name like 'UFC 278: ...'"""
         match = re.search(r'UFC\s+(\d+)', event_name)
         return match.group(1) if match else ''
     
-    def find_match(self, fighter_name, opponent_name, event_name=''):
+    def index_entry(self, fight):
+        """Normalized names, event number and card flag for one fight"""
+        f1 = self.normalize(fight.fighter1)
+        f2 = self.normalize(fight.fighter2)
+        f1_last = self.normalize(self.get_last_name(fight.fighter1))
+        f2_last = self.normalize(self.get_last_name(fight.fighter2))
+        event_num = self.extract_event_number(fight.event)
+        main_card = 'Main' in fight.card
+        # Names repeat across fights; intern so each is stored (and pickled) once
+        f1, f2, f1_last, f2_last, event_num = map(sys.intern, (f1, f2, f1_last, f2_last, event_num))
+        return (f1, f2, f1_last, f2_last, event_num, main_card)
+    
+    def build_index(self, fights, previous=None):
+        """Precompute normalized names and lookup tables for find_match.
+        
+        Each fight gets its normalized full names, last names and event
+        number computed once here instead of on every lookup. Fights that
+        are unchanged since the previous index reuse its entries.
+        """
+        known = dict(zip(previous.fights, previous.entries)) if previous else {}
+        index = MatchIndex(fights=fights)
+        
+        for idx, fight in enumerate(fights):
+            entry = known.get(fight) or self.index_entry(fight)
+            index.entries.append(entry)
+            f1, f2, f1_last, f2_last = entry[:4]
+            
+            for name in {f1, f2}:
+                index.by_name.setdefault(name, []).append(idx)
+            for last in {f1_last, f2_last}:
+                index.by_last.setdefault(last, []).append(idx)
+            key = tuple(sorted((f1_last, f2_last)))
+            index.by_last_pair.setdefault(key, []).append(idx)
+        
+        trigrams = {}
+        for name in index.by_name:
+            for i in range(len(name) - 2):
+                trigrams.setdefault(name[i:i + 3], set()).add(name)
+        # Postings are only ever scanned, so store them as compact tuples
+        index.name_trigrams = {gram: tuple(names) for gram, names in trigrams.items()}
+        for table in (index.by_name, index.by_last, index.by_last_pair):
+            for key, ids in table.items():
+                table[key] = tuple(ids)
+        
+        index.fighter_counts = {name: len(ids) for name, ids in index.by_name.items()}
+        self.build_availability(index)
+        return index
+    
+    @staticmethod
+    def pair_key(fighter_full, opponent_full, fighter_last, opponent_last):
+        """Order-independent key for a pair of normalized names: (full, last, full, last).
+        One flat tuple rather than a tuple of pairs, as there are thousands of them.
+        """
+        first, second = sorted(((fighter_full, fighter_last), (opponent_full, opponent_last)))
+        return first + second
+    
+    def build_availability(self, index):
+        """Precompute find_match results for every fighter pair in the database.
+        
+        Keys are pair_key(...) + (event number,). For each pair there is an
+        entry for no event number and one per event number among its
+        candidates; any other event number scores the same as none. Looking
+        up a fight whose names appear in the database this way gives exactly
+        what find_match would return.
+        """
+        for entry in index.entries:
+            f1, f2, f1_last, f2_last = entry[:4]
+            pair = self.pair_key(f1, f2, f1_last, f2_last)
+            if not f1_last or not f2_last or pair + ('',) in index.available:
+                continue
+            candidates = self.pair_candidates(index, f1, f2, f1_last, f2_last)
+            for event_num in {''} | {index.entries[idx][4] for idx in candidates}:
+                index.available[pair + (event_num,)] = self.best_match(
+                    index, candidates, f1, f2, f1_last, f2_last, event_num)
+    
+    def lookup_available(self, index, fighter_full, opponent_full, fighter_last, opponent_last, event_num):
+        """Look a fight up in the availability map.
+        Returns (True, URL or None) if the pair is in it, else (False, None).
+        """
+        pair = self.pair_key(fighter_full, opponent_full, fighter_last, opponent_last)
+        if pair + (event_num,) in index.available:
+            return True, index.available[pair + (event_num,)]
+        if pair + ('',) in index.available:
+            return True, index.available[pair + ('',)]
+        return False, None
+    
+    def related_names(self, index, query):
+        """Return database names that contain, or are contained in, query"""
+        related = set()
+        
+        # Database names that are substrings of the query
+        for start in range(len(query)):
+            for end in range(start + 1, len(query) + 1):
+                if query[start:end] in index.by_name:
+                    related.add(query[start:end])
+        if '' in index.by_name:
+            related.add('')
+        
+        # Database names that contain the query
+        if len(query) >= 3:
+            postings = [index.name_trigrams.get(query[i:i + 3], ())
+                        for i in range(len(query) - 2)]
+            pool = min(postings, key=len)
+        else:
+            pool = index.by_name.keys()
+        related.update(name for name in pool if query in name)
+        
+        return related
+    
+    def find_match(self, fighter_name, opponent_name, event_name='', fuzzy=True):
         """Find the best matching Paramount+ video for a fight.
-        Returns the video URL or None.
+        Returns the video URL or None. Unless fuzzy is False, a fight with no
+        exact match gets a second try with spelling-tolerant name matching.
+        """
+        started = time.perf_counter()
+        try:
+            fighter_last = self.normalize(self.get_last_name(fighter_name))
+            opponent_last = self.normalize(self.get_last_name(opponent_name))
+            fighter_full = self.normalize(fighter_name)
+            opponent_full = self.normalize(opponent_name)
+            event_num = self.extract_event_number(event_name)
+            
+            if not fighter_last or not opponent_last:
+                return None
+            
+            # Use one index throughout, even if a reload swaps in a new one
+            index = self.index
+            
+            found, url = self.lookup_available(index, fighter_full, opponent_full,
+                                               fighter_last, opponent_last, event_num)
+            if not found:
+                candidates = self.pair_candidates(index, fighter_full, opponent_full, fighter_last, opponent_last)
+                metrics.MATCHER_CANDIDATES.inc(len(candidates))
+                url = self.best_match(index, candidates, fighter_full, opponent_full,
+                                      fighter_last, opponent_last, event_num)
+            if url is None and fuzzy:
+                url, _ = self.fuzzy_match(index, self.similar_names(index, fighter_full),
+                                          opponent_full, event_num)
+            return url
+        finally:
+            metrics.FIND_MATCH_SECONDS.observe(time.perf_counter() - started)
+    
+    def pair_candidates(self, index, fighter_full, opponent_full, fighter_last, opponent_last):
+        """Entries that could match a fight, in database order.
+        Only entries that share a last-name pair or a related full name can
+        score, so gather those instead of scanning every fight.
+        """
+        candidates = set(index.by_last_pair.get(tuple(sorted((fighter_last, opponent_last))), ()))
+        fighter_names = self.related_names(index, fighter_full)
+        if fighter_names:
+            opponent_names = self.related_names(index, opponent_full)
+            for name in fighter_names:
+                for idx in index.by_name[name]:
+                    f1, f2 = index.entries[idx][:2]
+                    if f1 in opponent_names or f2 in opponent_names:
+                        candidates.add(idx)
+        return sorted(candidates)
+    
+    def find_matches(self, fighter_name, opponents, fuzzy=True):
+        """Find Paramount+ video URLs for several fights of one fighter.
+        opponents is a list of (opponent_name, event_name) pairs.
+        Returns a list of (video URL or None, confidence) in the same order;
+        confidence is 1.0 for exact matches and the name similarity for fuzzy ones.
+        """
+        match = self.fighter_matcher(fighter_name, fuzzy)
+        return [match(opponent_name, event_name) for opponent_name, event_name in opponents]
+    
+    def fighter_matcher(self, fighter_name, fuzzy=True):
+        """Return match(opponent_name, event_name) -> (video URL or None, confidence)
+        for one fighter's fights. The fighter's candidate pool and similar
+        names are worked out on first use and kept for later calls, so fights
+        that arrive one at a time (e.g. streamed) are matched as cheaply as
+        a whole history passed to find_matches.
         """
         fighter_last = self.normalize(self.get_last_name(fighter_name))
-        opponent_last = self.normalize(self.get_last_name(opponent_name))
         fighter_full = self.normalize(fighter_name)
-        opponent_full = self.normalize(opponent_name)
-        event_num = self.extract_event_number(event_name)
+        index = self.index
+        pool = None
+        fighter_names = None
         
-        if not fighter_last or not opponent_last:
-            return None
+        def match(opponent_name, event_name):
+            nonlocal pool, fighter_names
+            if not fighter_last:
+                return None, 0.0
+            started = time.perf_counter()
+            try:
+                opponent_last = self.normalize(self.get_last_name(opponent_name))
+                if not opponent_last:
+                    return None, 0.0
+                opponent_full = self.normalize(opponent_name)
+                event_num = self.extract_event_number(event_name)
+                
+                # Pairs that appear in the database are answered from the precomputed map
+                found, url = self.lookup_available(index, fighter_full, opponent_full,
+                                                   fighter_last, opponent_last, event_num)
+                if not found:
+                    if pool is None:
+                        # Every fight that can match involves this fighter, so narrow the
+                        # database down to their fights once and reuse it for each opponent
+                        pool = set(index.by_last.get(fighter_last, ()))
+                        for name in self.related_names(index, fighter_full):
+                            pool.update(index.by_name[name])
+                        pool = sorted(pool)
+                    metrics.MATCHER_CANDIDATES.inc(len(pool))
+                    url = self.best_match(index, pool, fighter_full, opponent_full,
+                                          fighter_last, opponent_last, event_num)
+                if url is not None:
+                    return url, 1.0
+                if not fuzzy:
+                    return None, 0.0
+                if fighter_names is None:
+                    fighter_names = self.similar_names(index, fighter_full)
+                return self.fuzzy_match(index, fighter_names, opponent_full, event_num)
+            finally:
+                metrics.FIND_MATCH_SECONDS.observe(time.perf_counter() - started)
         
+        return match
+    
+    def similar_names(self, index, query):
+        """Database names spelled like query, as [(similarity, name)], best first.
+        Trigram overlap picks a few candidates so only those get the
+        (slower) edit-distance scoring.
+        """
+        if len(query) < 4:
+            return []
+        grams = trigrams(query)
+        overlap = {}
+        for gram in grams:
+            for name in index.name_trigrams.get(gram, ()):
+                overlap[name] = overlap.get(name, 0) + 1
+        
+        # Rank by Dice coefficient over trigrams, keeping the best few. A name
+        # needs shared >= FUZZY_MIN_DICE * len(grams) / 2 to reach the minimum
+        floor = self.FUZZY_MIN_DICE * len(grams) / 2
+        shortlist = heapq.nlargest(self.FUZZY_CANDIDATES, (
+            (2 * shared / (len(grams) + max(len(name) - 2, 1)), name)
+            for name, shared in overlap.items() if shared >= floor
+        ))
+        scored = []
+        for dice, name in shortlist:
+            if dice < self.FUZZY_MIN_DICE:
+                break
+            similarity = name_similarity(query, name, self.FUZZY_MIN_SIMILARITY)
+            if similarity >= self.FUZZY_MIN_SIMILARITY:
+                scored.append((similarity, name))
+        scored.sort(reverse=True)
+        return scored
+    
+    def fuzzy_match(self, index, fighter_names, opponent_full, event_num):
+        """Second-stage match on names that are spelled differently.
+        fighter_names comes from similar_names. Only the opponents in those
+        fighters' videos are compared with opponent_full, and both sides must
+        look alike; the confidence of a fight is the weaker of the two.
+        Returns (video URL, confidence), or (None, 0.0).
+        """
+        best = None
+        opponent_grams = trigrams(opponent_full)
+        opponent_scores = {}
+        for fighter_similarity, name in fighter_names:
+            for idx in index.by_name[name]:
+                f1, f2, _, _, fight_event_num, main_card = index.entries[idx]
+                other = f2 if f1 == name else f1
+                if other not in opponent_scores:
+                    # Same trigram cut as similar_names before the slower scoring
+                    if dice(opponent_grams, trigrams(other)) < self.FUZZY_MIN_DICE:
+                        opponent_scores[other] = 0.0
+                    else:
+                        opponent_scores[other] = name_similarity(opponent_full, other, self.FUZZY_MIN_SIMILARITY)
+                opponent_similarity = opponent_scores[other]
+                if opponent_similarity < self.FUZZY_MIN_SIMILARITY:
+                    continue
+                confidence = min(fighter_similarity, opponent_similarity)
+                # Same tie-breaks as best_match: event number, then Main Card, then database order
+                rank = (confidence, bool(event_num) and event_num == fight_event_num, main_card, -idx)
+                if best is None or rank > best[0]:
+                    best = (rank, idx)
+        
+        if best is None:
+            return None, 0.0
+        return index.fights[best[1]].url, round(best[0][0], 3)
+    
+    def fighter_entries(self, index, fighter_name):
+        """Entry indexes of the fights of one fighter, in database order.
+        A side matches on the exact normalized name, or on the same last name
+        with a compatible first name (one a prefix of the other, as in
+        "Jon" / "Jonathan").
+        """
+        fighter_full = self.normalize(fighter_name)
+        fighter_last = self.normalize(self.get_last_name(fighter_name))
+        ids = set(index.by_name.get(fighter_full, ())) if fighter_full.strip() else set()
+        first = self.first_names(fighter_full, fighter_last)
+        if first:
+            for idx in index.by_last.get(fighter_last, ()):
+                f1, f2, f1_last, f2_last = index.entries[idx][:4]
+                for full, last in ((f1, f1_last), (f2, f2_last)):
+                    other = self.first_names(full, last)
+                    if last == fighter_last and other and (other.startswith(first) or first.startswith(other)):
+                        ids.add(idx)
+        return sorted(ids)
+    
+    def fighter_fights(self, fighter_name):
+        """Every Paramount+ fight of fighter_name (see fighter_entries), in database order"""
+        index = self.index
+        return [index.fights[idx] for idx in self.fighter_entries(index, fighter_name)]
+    
+    def available_count(self, fighter_name):
+        """How many Paramount+ videos fighter_fights would list for this fighter"""
+        return len(self.fighter_entries(self.index, fighter_name))
+    
+    def popular_fighters(self, limit=50):
+        """Normalized names of the fighters with the most Paramount+ videos"""
+        counts = self.index.fighter_counts
+        return heapq.nlargest(limit, (name for name in counts if name.strip()), key=counts.get)
+    
+    def best_match(self, index, candidates, fighter_full, opponent_full,
+                   fighter_last, opponent_last, event_num):
+        """Score candidate entries (in database order) and return the best URL"""
         best_match = None
         best_score = 0
         
-        for fight in self.fights:
-            f1 = self.normalize(fight['fighter1'])
-            f2 = self.normalize(fight['fighter2'])
-            f1_last = self.normalize(self.get_last_name(fight['fighter1']))
-            f2_last = self.normalize(self.get_last_name(fight['fighter2']))
-            fight_event = fight.get('event', '')
-            fight_event_num = self.extract_event_number(fight_event)
+        # Candidates come in database order so ties resolve as before
+        for idx in candidates:
+            f1, f2, f1_last, f2_last, fight_event_num, main_card = index.entries[idx]
             
             score = 0
             
@@ -110,148 +535,495 @@ class ParamountMatcher:
                 score += 3
             
             # Prefer Main Card over Prelims
-            card = fight.get('card', '')
-            if 'Main' in card:
+            if main_card:
                 score += 1
             
             if score > best_score:
                 best_score = score
-                best_match = fight
+                best_match = index.fights[idx]
         
         if best_match:
-            return best_match['url']
+            return best_match.url
         
         return None
 
 paramount = ParamountMatcher()
 
+class FightFeed:
+    """Fights of one fighter page, appended by the thread reading it from
+    ufcstats.com and read by any number of clients at their own pace"""
+    
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.fights = []
+        self.done = False
+        self.error = None
+    
+    def put(self, fight):
+        with self.cond:
+            self.fights.append(fight)
+            self.cond.notify_all()
+    
+    def close(self, error=None):
+        with self.cond:
+            self.done = True
+            self.error = error
+            self.cond.notify_all()
+    
+    def __iter__(self):
+        """Yield a copy of each fight as it arrives; raise the reader's error, if any"""
+        position = 0
+        while True:
+            with self.cond:
+                while position == len(self.fights) and not self.done:
+                    self.cond.wait()
+                new = self.fights[position:]
+                done, error = self.done, self.error
+            position += len(new)
+            for fight in new:
+                yield dict(fight)
+            if done:
+                if error is not None:
+                    raise error
+                return
+
 class UFCFighterSearch:
     """Handles searching for UFC fighters and their fight history"""
     
-    def __init__(self):
-        self.base_url = "http://ufcstats.com"
+    # How long cached ufcstats pages stay fresh, in seconds
+    SEARCH_TTL = 10 * 60
+    ACTIVE_FIGHTER_TTL = 6 * 60 * 60
+    RETIRED_FIGHTER_TTL = 7 * 24 * 60 * 60
+    # A fighter whose latest listed fight is older than this counts as retired
+    RETIRED_AFTER_DAYS = 2 * 365
+    # Bytes read from ufcstats.com at a time when streaming a fighter page
+    STREAM_CHUNK_SIZE = 16 * 1024
+    # Threads reading streamed fighter pages from ufcstats.com
+    STREAM_WORKERS = 16
+    
+    def __init__(self, cache=None, session=None, parser=None, strain=True):
+        # UFC_STATS_URL points at a stand-in (e.g. benchmarks/stub_ufcstats.py) for load tests
+        self.base_url = os.environ.get('UFC_STATS_URL', "http://ufcstats.com")
         self.search_url = f"{self.base_url}/statistics/fighters/search"
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+        # Set UFC_CACHE_DB to a file path to keep cached pages across restarts
+        self.cache = cache or ResponseCache(db_path=os.environ.get('UFC_CACHE_DB'))
+        # One pooled keep-alive session shared by every request thread
+        self.session = session or UpstreamSession(headers=self.headers)
+        # HTML parser backend: 'stream', 'lxml' or 'html.parser'
+        self.parser = parser or os.environ.get('UFC_HTML_PARSER', 'stream')
+        self.strain = strain
+        # Identical searches / fighter pages requested at the same time share one fetch
+        self.flights = SingleFlight()
+        # Streamed fighter pages being read, by flight key, so later streams can follow along
+        self.feeds = {}
+        self.stream_pool = ThreadPoolExecutor(self.STREAM_WORKERS, thread_name_prefix='page-stream')
+    
+    def fetch(self, url, params=None, ttl=SEARCH_TTL):
+        """Fetch a page through the response cache.
+        ttl is a number of seconds, or a function of the page content
+        returning one. Returns the page content, or None if the page does not
+        exist; raises UpstreamError on an error reply.
+        """
+        key, entry, fresh = self.lookup(url, params)
+        if fresh:
+            return entry['body']
+        
+        with metrics.stage('upstream_fetch'):
+            response = self.session.get(url, params=params, headers=self.revalidation_headers(entry), timeout=10)
+        return self.store(key, entry, response.status_code, response.content, response.headers, ttl)
+    
+    def lookup(self, url, params=None):
+        """Find url in the cache. Returns (key, entry or None, is_fresh)"""
+        key = self.cache.make_key(url, params)
+        entry = self.cache.get(key)
+        if entry and entry['expires'] > time.time():
+            self.cache.count('hits')
+            return key, entry, True
+        self.cache.count('misses')
+        return key, entry, False
+    
+    @staticmethod
+    def revalidation_headers(entry):
+        """Headers asking upstream to confirm a stale copy instead of resending it"""
+        headers = {}
+        if entry and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def store(self, key, entry, status_code, content, response_headers, ttl):
+        """Cache an upstream reply and return the page content, or None for a
+        missing page. Any other error status raises UpstreamError.
+        """
+        if status_code == 304 and entry:
+            self.cache.count('revalidated')
+            self.cache.refresh(key, entry, ttl(entry['body']) if callable(ttl) else ttl)
+            return entry['body']
+        
+        if status_code == 200:
+            self.cache.put(key, content, ttl(content) if callable(ttl) else ttl,
+                           response_headers.get('ETag'), response_headers.get('Last-Modified'))
+            return content
+        
+        if status_code in (404, 410):
+            return None
+        raise UpstreamError(f"ufcstats.com answered {status_code}")
+    
+    def fighter_page_ttl(self, content):
+        """Cache fighters who haven't fought in a long time for longer"""
+        dates = re.findall(rb'\b([A-Z][a-z]{2})\. (\d{2}), (\d{4})\b', content)
+        latest = None
+        for month, day, year in dates:
+            try:
+                date = datetime.strptime(f"{month.decode()} {day.decode()} {year.decode()}", '%b %d %Y')
+            except ValueError:
+                continue
+            if latest is None or date > latest:
+                latest = date
+        
+        if latest and (datetime.now() - latest).days > self.RETIRED_AFTER_DAYS:
+            return self.RETIRED_FIGHTER_TTL
+        return self.ACTIVE_FIGHTER_TTL
         
     def search_fighter(self, fighter_name):
-        """Search for a fighter by name"""
+        """Search for a fighter by name. Raises UpstreamError if the search
+        could not be run, so that isn't mistaken for "no fighters found"
+        """
+        key = ('search', ' '.join(fighter_name.lower().split()))
+        try:
+            return self.flights.do(key, lambda: self.load_search_results(fighter_name))
+        except Exception as e:
+            metrics.ERRORS.inc(1, 'search_fighter')
+            print(f"Error searching for fighter: {e}")
+            raise UpstreamError(str(e)) from e
+    
+    def load_search_results(self, fighter_name):
+        """Fetch and parse ufcstats search results for a name"""
+        # Search on UFC Stats website
+        params = {
+            'query': fighter_name
+        }
+        
+        content = self.fetch(self.search_url, params, ttl=self.SEARCH_TTL)
+        
+        if content is not None:
+            return [
+                {'name': f['name'], 'url': f['url'], 'record': f['record']}
+                for f in self.parse_fighter_list(content)
+            ]
+        
+        return []
+    
+    def list_fighters(self, letter):
+        """Get every fighter on the ufcstats A-Z listing page for a letter"""
         try:
-            # Search on UFC Stats website
             params = {
-                'query': fighter_name
-            }
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+                'char': letter,
+                'page': 'all'
             }
             
-            response = requests.get(self.search_url, params=params, headers=headers, timeout=10)
+            # Listing pages are large and only crawled occasionally, so skip the cache
+            response = self.session.get(f"{self.base_url}/statistics/fighters",
+                                        params=params, timeout=30)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                fighters = []
-                
-                # Find fighter links in the search results
-                fighter_rows = soup.find_all('tr', class_='b-statistics__table-row')
-                
-                for row in fighter_rows[1:]:  # Skip header row
-                    cols = row.find_all('td')
-                    
-                    if len(cols) >= 10:
-                        # Column 0: First name
-                        first_name_link = cols[0].find('a', class_='b-link')
-                        # Column 1: Last name
-                        last_name_link = cols[1].find('a', class_='b-link')
-                        
-                        if first_name_link and last_name_link:
-                            # Get full name
-                            first_name = first_name_link.text.strip()
-                            last_name = last_name_link.text.strip()
-                            full_name = f"{first_name} {last_name}"
-                            fighter_url = first_name_link.get('href')
-                            
-                            # Build record from columns 7, 8, 9 (Wins, Losses, Draws)
-                            wins = cols[7].text.strip()
-                            losses = cols[8].text.strip()
-                            draws = cols[9].text.strip()
-                            record = f"{wins}-{losses}-{draws}"
-                            
-                            fighters.append({
-                                'name': full_name,
-                                'url': fighter_url,
-                                'record': record
-                            })
-                
-                return fighters
+                return self.parse_fighter_list(response.content)
             
             return []
         except Exception as e:
-            print(f"Error searching for fighter: {e}")
+            metrics.ERRORS.inc(1, 'list_fighters')
+            print(f"Error listing fighters: {e}")
             return []
     
+    def make_soup(self, content, strainer):
+        """Parse HTML with the configured backend, keeping only strainer matches"""
+        return BeautifulSoup(content, self.parser, parse_only=strainer if self.strain else None)
+    
+    def parse_fighter_list(self, content):
+        """Parse a fighter table (search results or A-Z listing)"""
+        if self.parser == 'stream':
+            with metrics.stage('html_parse'):
+                rows = extract_rows(content, 'b-statistics__table-row')
+            with metrics.stage('row_extraction'):
+                return fighters_from_rows(rows)
+        
+        with metrics.stage('html_parse'):
+            soup = self.make_soup(content, SEARCH_ROWS)
+        with metrics.stage('row_extraction'):
+            return self.fighters_from_soup(soup)
+    
+    def fighters_from_soup(self, soup):
+        fighters = []
+        
+        # Find fighter links in the search results
+        fighter_rows = soup.find_all('tr', class_='b-statistics__table-row')
+        
+        for row in fighter_rows[1:]:  # Skip header row
+            cols = row.find_all('td')
+            
+            if len(cols) >= 10:
+                # Column 0: First name
+                first_name_link = cols[0].find('a', class_='b-link')
+                # Column 1: Last name
+                last_name_link = cols[1].find('a', class_='b-link')
+                
+                if first_name_link and last_name_link:
+                    # Get full name
+                    first_name = first_name_link.text.strip()
+                    last_name = last_name_link.text.strip()
+                    full_name = f"{first_name} {last_name}"
+                    fighter_url = first_name_link.get('href')
+                    
+                    # Build record from columns 7, 8, 9 (Wins, Losses, Draws)
+                    wins = cols[7].text.strip()
+                    losses = cols[8].text.strip()
+                    draws = cols[9].text.strip()
+                    record = f"{wins}-{losses}-{draws}"
+                    
+                    fighters.append({
+                        'name': full_name,
+                        'url': fighter_url,
+                        'record': record,
+                        'first': first_name,
+                        'last': last_name,
+                        'nickname': cols[2].text.strip()
+                    })
+        
+        return fighters
+    
     def get_fighter_fights(self, fighter_url):
-        """Get all fights for a specific fighter"""
+        """Get all fights for a specific fighter. Raises UpstreamError if the
+        page could not be loaded
+        """
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
+            return self.flights.do(('fights', fighter_url), lambda: self.load_fighter_fights(fighter_url))
+        except Exception as e:
+            metrics.ERRORS.inc(1, 'get_fighter_fights')
+            print(f"Error getting fighter fights: {e}")
+            raise UpstreamError(str(e)) from e
+    
+    def load_fighter_fights(self, fighter_url):
+        """Fetch and parse a fighter page"""
+        content = self.fetch(fighter_url, ttl=self.fighter_page_ttl)
+        
+        if content is not None:
+            return self.parse_fighter_fights(content)
+        
+        return []
+    
+    def stream_fighter_fights(self, fighter_url):
+        """Yield a fighter's fights one by one as the page arrives.
+        Always uses the streaming row extractor. A fresh cached page is read
+        straight from the cache. Otherwise the page is read from ufcstats.com
+        on stream_pool into a FightFeed, which this and any later stream of
+        the same page follow; a load of it already running without a feed
+        is joined and replayed when it is done. The reading thread caches
+        the page and frees the upstream slot as soon as all of it is in,
+        however slowly the clients take the fights, or if they go away.
+        """
+        key, entry, fresh = self.lookup(fighter_url)
+        if fresh:
+            yield from iter_fights([entry['body']])
+            return
+        
+        flight_key = ('fights', fighter_url)
+        call, leader = self.flights.begin(flight_key)
+        if not leader:
+            feed = self.feeds.get(flight_key)
+            yield from feed if feed is not None else self.flights.wait(call)
+            return
+        
+        feed = self.feeds[flight_key] = FightFeed()
+        try:
+            self.stream_pool.submit(self.read_feed, fighter_url, key, entry, call, feed)
+        except BaseException as e:
+            self.feeds.pop(flight_key, None)
+            self.flights.finish(flight_key, call, error=e)
+            raise
+        yield from feed
+    
+    def read_feed(self, fighter_url, key, entry, call, feed):
+        """Read a fighter page into feed, then finish its single-flight call"""
+        flight_key = ('fights', fighter_url)
+        error = None
+        try:
+            for fight in self.stream_page_fights(fighter_url, key, entry):
+                feed.put(fight)
+        except Exception as e:
+            error = e
+        finally:
+            self.feeds.pop(flight_key, None)
+            feed.close(error)
+            self.flights.finish(flight_key, call, feed.fights, error)
+    
+    def stream_page_fights(self, fighter_url, key, entry):
+        """Stream a fighter page from ufcstats.com, yielding fights as rows arrive"""
+        with ExitStack() as stack:
+            with metrics.stage('upstream_fetch'):
+                # The host's request slot is held until the whole body is read
+                response = stack.enter_context(self.session.stream(
+                    fighter_url, headers=self.revalidation_headers(entry), timeout=10))
+            if response.status_code != 200:
+                content = self.store(key, entry, response.status_code, response.content,
+                                     response.headers, self.fighter_page_ttl)
+                if content is not None:
+                    yield from iter_fights([content])
+                return
             
-            response = requests.get(fighter_url, headers=headers, timeout=10)
+            body = []
+            def chunks():
+                for chunk in response.iter_content(self.STREAM_CHUNK_SIZE):
+                    body.append(chunk)
+                    yield chunk
             
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                fights = []
+            yield from iter_fights(chunks())
+            self.store(key, entry, 200, b''.join(body), response.headers, self.fighter_page_ttl)
+    
+    def parse_fighter_fights(self, content):
+        """Parse the fight history table of a fighter page"""
+        if self.parser == 'stream':
+            with metrics.stage('html_parse'):
+                rows = extract_rows(content, 'b-fight-details__table-row')
+            with metrics.stage('row_extraction'):
+                return fights_from_rows(rows)
+        
+        with metrics.stage('html_parse'):
+            soup = self.make_soup(content, FIGHT_ROWS)
+        with metrics.stage('row_extraction'):
+            return self.fights_from_soup(soup)
+    
+    def fights_from_soup(self, soup):
+        fights = []
+        
+        # Find the fight history table
+        fight_rows = soup.find_all('tr', class_='b-fight-details__table-row')
+        
+        for row in fight_rows[1:]:  # Skip header
+            cols = row.find_all('td')
+            
+            if len(cols) >= 7:
+                # Column 0: W/L/D - SKIP THIS to avoid spoilers
+                # Column 1: Both fighters (current fighter and opponent)
+                # Column 6: Event name and date
                 
-                # Find the fight history table
-                fight_rows = soup.find_all('tr', class_='b-fight-details__table-row')
+                fighters_col = cols[1]
+                event_col = cols[6]
                 
-                # Get the fighter's name from the page
-                fighter_name_elem = soup.find('span', class_='b-content__title-highlight')
-                current_fighter = fighter_name_elem.text.strip() if fighter_name_elem else ""
+                # Get event info from column 6
+                event_link = event_col.find('a', class_='b-link')
+                date_elems = event_col.find_all('p', class_='b-fight-details__table-text')
                 
-                for row in fight_rows[1:]:  # Skip header
-                    cols = row.find_all('td')
+                if event_link:
+                    event_name = event_link.text.strip()
+                    event_url = event_link.get('href', '')
+                    event_date = date_elems[1].text.strip() if len(date_elems) > 1 else "Date Unknown"
                     
-                    if len(cols) >= 7:
-                        # Column 0: W/L/D - SKIP THIS to avoid spoilers
-                        # Column 1: Both fighters (current fighter and opponent)
-                        # Column 6: Event name and date
-                        
-                        fighters_col = cols[1]
-                        event_col = cols[6]
-                        
-                        # Get event info from column 6
-                        event_link = event_col.find('a', class_='b-link')
-                        date_elems = event_col.find_all('p', class_='b-fight-details__table-text')
-                        
-                        if event_link:
-                            event_name = event_link.text.strip()
-                            event_url = event_link.get('href', '')
-                            event_date = date_elems[1].text.strip() if len(date_elems) > 1 else "Date Unknown"
-                            
-                            # Get opponent from column 1 (has both fighters)
-                            fighter_links = fighters_col.find_all('a', class_='b-link')
-                            opponent = "Unknown"
-                            
-                            if len(fighter_links) >= 2:
-                                # Second link is the opponent
-                                opponent = fighter_links[1].text.strip()
-                            
-                            fights.append({
-                                'event': event_name,
-                                'date': event_date,
-                                'opponent': opponent,
-                                'event_url': event_url
-                            })
-                
-                return fights
-            
-            return []
-        except Exception as e:
-            print(f"Error getting fighter fights: {e}")
-            return []
+                    # Get opponent from column 1 (has both fighters)
+                    fighter_links = fighters_col.find_all('a', class_='b-link')
+                    opponent = "Unknown"
+                    opponent_url = ''
+                    
+                    if len(fighter_links) >= 2:
+                        # Second link is the opponent
+                        opponent = fighter_links[1].text.strip()
+                        opponent_url = fighter_links[1].get('href', '')
+                    
+                    fights.append({
+                        'event': event_name,
+                        'date': event_date,
+                        'opponent': opponent,
+                        'opponent_url': opponent_url,
+                        'event_url': event_url
+                    })
+        
+        return fights
     
 # Initialize the fighter search
 ufc_search = UFCFighterSearch()
 
+# Local fighter list for autocomplete (build it with: python fighter_directory.py)
+fighter_directory = FighterDirectory()
+
+# Loads opponents' pages after each fight history, and the fighters with the
+# most Paramount+ videos every few hours
+prefetcher = Prefetcher(ufc_search, fighter_directory)
+
+background_tasks_lock = threading.Lock()
+background_tasks_pid = None
+
+def start_background_tasks():
+    """Start the background threads, once per process. Not done on import,
+    so scripts and benchmarks that import this module stay quiet; servers
+    call it at startup, and otherwise the first request does (see below).
+    """
+    global background_tasks_pid
+    with background_tasks_lock:
+        # Threads don't survive a fork, so a forked worker starts its own
+        if background_tasks_pid == os.getpid():
+            return
+        background_tasks_pid = os.getpid()
+    
+    # Pick up a freshly scraped paramount_fights.json without a restart
+    paramount.start_watching()
+    fighter_directory.start_background_refresh(ufc_search.list_fighters)
+    
+    # UFC_PREFETCH=0 turns off prefetching and the warm-up
+    if os.environ.get('UFC_PREFETCH', '1') != '0':
+        prefetcher.start()
+        warm_up_count = int(os.environ.get('UFC_WARMUP_FIGHTERS', 50))
+        prefetcher.start_warm_up(lambda: paramount.popular_fighters(warm_up_count),
+                                 interval=UFCFighterSearch.ACTIVE_FIGHTER_TTL)
+
+# Under gunicorn or any other WSGI server loading app:app nothing calls
+# start_background_tasks, so each worker starts them on its first request
+@app.before_request
+def ensure_background_tasks():
+    if background_tasks_pid != os.getpid():
+        start_background_tasks()
+
+# ETags, Cache-Control and compression on the JSON endpoints; responses
+# change with the Paramount+ database, so its version goes into the ETag
+http_response.init_app(app, lambda: paramount.stamp)
+
+# Per-endpoint and per-stage timings, plus counters kept elsewhere, for /metrics
+metrics.init_app(app)
+metrics.Collected('ufc_upstream_cache_total', 'ufcstats.com response cache lookups and stores',
+                  lambda: dict(ufc_search.cache.stats), kind='counter', label='result')
+metrics.Collected('ufc_upstream_requests_total', 'Requests sent to ufcstats.com',
+                  lambda: ufc_search.session.metrics()['requests'], kind='counter')
+metrics.Collected('ufc_upstream_errors_total', 'Requests to ufcstats.com that failed',
+                  lambda: ufc_search.session.metrics()['errors'], kind='counter')
+metrics.Collected('ufc_upstream_in_flight', 'Requests to ufcstats.com currently open',
+                  lambda: ufc_search.session.metrics()['in_flight'])
+metrics.Collected('ufc_upstream_pool_utilization', 'Share of the upstream connection pool in use',
+                  lambda: ufc_search.session.metrics()['pool_utilization'])
+metrics.Collected('ufc_upstream_host_utilization', 'Share of the per-host request limit in use',
+                  lambda: ufc_search.session.metrics()['host_utilization'], label='host')
+metrics.Collected('ufc_single_flight_total', 'Page loads that led a fetch or joined one already running',
+                  lambda: dict(ufc_search.flights.stats), kind='counter', label='role')
+metrics.Collected('ufc_prefetch_total', 'Background page prefetches by outcome',
+                  lambda: dict(prefetcher.stats), kind='counter', label='result')
+metrics.Collected('ufc_paramount_fights', 'Fights in the loaded Paramount+ database',
+                  lambda: len(paramount.fights))
+
+def add_paramount_links(fights, fighter_name, match=None):
+    """Resolve Paramount+ links for a whole fight history in one pass.
+    Pass match from paramount.fighter_matcher(fighter_name) to share one
+    fighter's candidate pool across several calls.
+    """
+    match = match or paramount.fighter_matcher(fighter_name)
+    with metrics.stage('find_match'):
+        matches = [match(fight['opponent'], fight['event']) for fight in fights]
+    for fight, (url, confidence) in zip(fights, matches):
+        fight['paramount_available'] = url is not None
+        fight['paramount_url'] = url
+        fight['paramount_confidence'] = confidence
+    return fights
+
 @app.route('/')
 def index():
     """Render the main page"""
@@ -265,12 +1037,24 @@ def search():
     if not fighter_name:
         return jsonify({'error': 'Please provide a fighter name'}), 400
     
-    fighters = ufc_search.search_fighter(fighter_name)
+    # Answer from the local directory once it has the whole A-Z listing
+    if fighter_directory.complete:
+        fighters, complete = fighter_directory.lookup(fighter_name)
+    else:
+        try:
+            fighters, complete = ufc_search.search_fighter(fighter_name), False
+        except UpstreamError:
+            return jsonify({'error': UPSTREAM_ERROR}), 502
+    
+    for fighter in fighters:
+        fighter['paramount_count'] = paramount.available_count(fighter['name'])
     
-    return jsonify({
-        'fighters': fighters,
-        'count': len(fighters)
-    })
+    with metrics.stage('json'):
+        return jsonify({
+            'fighters': fighters,
+            'count': len(fighters),
+            'complete': complete
+        })
 
 @app.route('/api/fights', methods=['GET'])
 def get_fights():
@@ -281,19 +1065,78 @@ def get_fights():
     if not fighter_url:
         return jsonify({'error': 'Please provide a fighter URL'}), 400
     
-    fights = ufc_search.get_fighter_fights(fighter_url)
+    try:
+        fights = ufc_search.get_fighter_fights(fighter_url)
+    except UpstreamError:
+        return jsonify({'error': UPSTREAM_ERROR}), 502
+    add_paramount_links(fights, fighter_name)
+    prefetcher.prefetch_opponents(fights)
     
-    # Check Paramount+ availability for each fight
-    for fight in fights:
-        url = paramount.find_match(fighter_name, fight['opponent'], fight['event'])
-        fight['paramount_available'] = url is not None
+    with metrics.stage('json'):
+        return jsonify({
+            'fights': fights,
+            'count': len(fights)
+        })
+
+
+@app.route('/api/fights/stream', methods=['GET'])
+def stream_fights():
+    """Like /api/fights, but sends each fight as an NDJSON line as soon as it
+    is parsed and matched: {"fight": {...}} per fight, then {"count": n},
+    or {"error": "..."} if loading fails part way.
+    """
+    fighter_url = request.args.get('url', '')
+    fighter_name = request.args.get('name', '')
+    
+    if not fighter_url:
+        return jsonify({'error': 'Please provide a fighter URL'}), 400
     
-    return jsonify({
-        'fights': fights,
-        'count': len(fights)
-    })
+    def generate():
+        count = 0
+        opponents = []
+        # Built once, so each fight is matched against the same candidate pool
+        match = paramount.fighter_matcher(fighter_name)
+        try:
+            for fight in ufc_search.stream_fighter_fights(fighter_url):
+                add_paramount_links([fight], fighter_name, match)
+                count += 1
+                if len(opponents) < prefetcher.opponents:
+                    opponents.append(fight)
+                yield json.dumps({'fight': fight}) + '\n'
+        except Exception as e:
+            metrics.ERRORS.inc(1, 'stream_fights')
+            print(f"Error streaming fighter fights: {e}")
+            yield json.dumps({'error': 'Error loading fight history'}) + '\n'
+            return
+        prefetcher.prefetch_opponents(opponents)
+        yield json.dumps({'count': count}) + '\n'
+    
+    # Not cached or compressed, both of which would hold the body back;
+    # X-Accel-Buffering stops nginx from buffering it too
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson',
+                    headers={'Cache-Control': 'no-store', 'X-Accel-Buffering': 'no'})
 
 
+@app.route('/api/watchable', methods=['GET'])
+def get_watchable():
+    """API endpoint listing a fighter's fights on Paramount+, from the local database only"""
+    fighter_name = request.args.get('name', '')
+    
+    if not fighter_name:
+        return jsonify({'error': 'Please provide a fighter name'}), 400
+    
+    fights = [
+        {'fighter1': f.fighter1, 'fighter2': f.fighter2, 'event': f.event,
+         'card': f.card, 'title': f.title, 'url': f.url}
+        for f in paramount.fighter_fights(fighter_name)
+    ]
+    
+    with metrics.stage('json'):
+        return jsonify({
+            'fights': fights,
+            'count': len(fights)
+        })
+
 @app.route('/api/paramount-link', methods=['GET'])
 def get_paramount_link():
     """API endpoint to find the direct Paramount+ video URL for a fight"""
@@ -315,8 +1158,16 @@ def get_paramount_link():
         fallback_url = f"https://www.paramountplus.com/search/?q={search_query}"
         return jsonify({'url': fallback_url, 'found': False})
 
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Request timings and counters in the Prometheus text format"""
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 
 if __name__ == '__main__':
     print("Starting UFC Fight Finder...")
     print("Open your browser and go to: http://localhost:5000")
+    # With the reloader on, requests are served by a child process; start there only
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_tasks()
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,119 @@
+"""
+ASGI entry point for UFC Fight Finder.
+Run with: python -m uvicorn asgi:application --port 5000
+
+/api/fights is served natively on the event loop, so many requests can
+wait on a slow ufcstats.com at once without a thread each. Every other
+route is handed to the Flask app through asgiref's WSGI adapter. Work
+that would block the loop (Paramount+ matching, JSON encoding and
+compression) is run in the default thread pool.
+"""
+from urllib.parse import parse_qs
+import asyncio
+import json
+
+from asgiref.wsgi import WsgiToAsgi
+
+from app import (UPSTREAM_ERROR, add_paramount_links, app, paramount, prefetcher,
+                 start_background_tasks, ufc_search)
+from async_search import AsyncUFCFighterSearch
+import http_response
+from http_session import UpstreamError
+import metrics
+
+async_search = AsyncUFCFighterSearch(ufc_search)
+flask_app = WsgiToAsgi(app)
+
+
+def request_header(scope, name):
+    for key, value in scope['headers']:
+        if key == name:
+            return value.decode('latin-1')
+    return ''
+
+
+def encode_json(scope, payload, status):
+    """Encode a JSON response body, with the same caching and compression as the Flask app"""
+    with metrics.stage('json'):
+        body = json.dumps(payload, sort_keys=True).encode('utf-8')
+    extra = dict(http_response.NO_STORE)
+    if status == 200:
+        status, extra, body = http_response.prepare(scope['path'], body, paramount.stamp,
+                                                    request_header(scope, b'if-none-match'),
+                                                    request_header(scope, b'accept-encoding'))
+    return status, extra, body
+
+
+async def send_json(scope, send, payload, status=200):
+    """Send a JSON response"""
+    status, extra, body = await asyncio.to_thread(encode_json, scope, payload, status)
+    headers = [(key.lower().encode(), value.encode()) for key, value in extra.items()]
+    if status != 304:
+        headers += [(b'content-type', b'application/json'),
+                    (b'content-length', str(len(body)).encode())]
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': headers,
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def link_fights(fights, fighter_name):
+    """Add Paramount+ links and queue the opponents' pages (blocking)"""
+    add_paramount_links(fights, fighter_name)
+    prefetcher.prefetch_opponents(fights)
+
+
+async def get_fights(scope, send):
+    """Async /api/fights. Pass events=1 to also fetch each event's location"""
+    args = parse_qs(scope['query_string'].decode('utf-8'))
+    fighter_url = args.get('url', [''])[0]
+    fighter_name = args.get('name', [''])[0]
+
+    if not fighter_url:
+        await send_json(scope, send, {'error': 'Please provide a fighter URL'}, 400)
+        return
+
+    try:
+        fights = await async_search.get_fighter_fights(fighter_url)
+    except UpstreamError:
+        await send_json(scope, send, {'error': UPSTREAM_ERROR}, 502)
+        return
+    await asyncio.to_thread(link_fights, fights, fighter_name)
+
+    if args.get('events', [''])[0] == '1':
+        locations = await async_search.get_event_locations(f['event_url'] for f in fights)
+        for fight in fights:
+            fight['event_location'] = locations.get(fight['event_url'], '')
+
+    await send_json(scope, send, {
+        'fights': fights,
+        'count': len(fights)
+    })
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            start_background_tasks()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await async_search.close()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+    elif scope['type'] == 'http' and scope['path'] == '/api/fights' and scope['method'] == 'GET':
+        # Threads aren't per request here, so it is timed but not sampled
+        token = metrics.begin_request(profile=False)
+        try:
+            await get_fights(scope, send)
+        finally:
+            metrics.end_request(token, 'get_fights')
+    else:
+        await flask_app(scope, receive, send)
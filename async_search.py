@@ -0,0 +1,109 @@
+"""
+Asyncio counterpart of UFCFighterSearch, used by the ASGI entry point.
+Shares the sync searcher's response cache and HTML parsers, but talks to
+ufcstats.com through one pooled httpx.AsyncClient, so a slow upstream
+parks a coroutine instead of tying up a worker thread. The blocking parts
+(cache reads and writes, which may hit SQLite, and HTML parsing) run in
+the default thread pool so they never stall the event loop. Fighter page
+loads join the sync searcher's single-flight calls, and requests count
+against the same per-host limit as its UpstreamSession.
+"""
+import asyncio
+import re
+
+import httpx
+
+from http_session import UpstreamError
+import metrics
+
+# Event pages describe finished events, so they rarely change
+EVENT_TTL = 7 * 24 * 60 * 60
+
+LOCATION = re.compile(rb'Location:\s*</i>\s*([^<]+)')
+
+
+class AsyncUFCFighterSearch:
+    """Async fetching for UFCFighterSearch, with concurrent fan-out"""
+
+    def __init__(self, search, max_connections=50):
+        self.search = search
+        self.max_connections = max_connections
+        self.client = None
+
+    def get_client(self):
+        """Create the shared client lazily, inside the running event loop"""
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                headers=self.search.headers,
+                timeout=10,
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+                transport=httpx.AsyncHTTPTransport(retries=2),
+            )
+        return self.client
+
+    async def close(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def fetch(self, url, params=None, ttl=None):
+        """Async version of UFCFighterSearch.fetch, using the same cache"""
+        ttl = ttl or self.search.SEARCH_TTL
+        key, entry, fresh = await asyncio.to_thread(self.search.lookup, url, params)
+        if fresh:
+            return entry['body']
+
+        async with self.search.session.async_slot(url):
+            with metrics.stage('upstream_fetch'):
+                response = await self.get_client().get(
+                    url, params=params, headers=self.search.revalidation_headers(entry))
+        return await asyncio.to_thread(self.search.store, key, entry, response.status_code,
+                                       response.content, response.headers, ttl)
+
+    async def search_fighter(self, fighter_name):
+        """Search for a fighter by name. Raises UpstreamError if the search failed"""
+        try:
+            content = await self.fetch(self.search.search_url, {'query': fighter_name},
+                                       ttl=self.search.SEARCH_TTL)
+            if content is not None:
+                fighters = await asyncio.to_thread(self.search.parse_fighter_list, content)
+                return [{'name': f['name'], 'url': f['url'], 'record': f['record']} for f in fighters]
+            return []
+        except Exception as e:
+            metrics.ERRORS.inc(1, 'search_fighter')
+            print(f"Error searching for fighter: {e}")
+            raise UpstreamError(str(e)) from e
+
+    async def get_fighter_fights(self, fighter_url):
+        """Get all fights for a specific fighter. Raises UpstreamError if the page could not be loaded"""
+        try:
+            return await self.search.flights.do_async(('fights', fighter_url),
+                                                      lambda: self.load_fighter_fights(fighter_url))
+        except Exception as e:
+            metrics.ERRORS.inc(1, 'get_fighter_fights')
+            print(f"Error getting fighter fights: {e}")
+            raise UpstreamError(str(e)) from e
+
+    async def load_fighter_fights(self, fighter_url):
+        """Fetch and parse a fighter page"""
+        content = await self.fetch(fighter_url, ttl=self.search.fighter_page_ttl)
+        if content is not None:
+            return await asyncio.to_thread(self.search.parse_fighter_fights, content)
+        return []
+
+    async def get_event_locations(self, event_urls):
+        """Fetch event pages concurrently. Returns {event_url: location}"""
+        urls = [url for url in dict.fromkeys(event_urls) if url]
+        pages = await asyncio.gather(*(self.fetch(url, ttl=EVENT_TTL) for url in urls),
+                                     return_exceptions=True)
+
+        locations = {}
+        for url, content in zip(urls, pages):
+            if isinstance(content, Exception):
+                print(f"Error getting event page {url}: {content}")
+                continue
+            match = LOCATION.search(content or b'')
+            if match:
+                locations[url] = match.group(1).decode('utf-8', errors='replace').strip()
+        return locations
@@ -0,0 +1,73 @@
+"""
+Benchmark reading video links off a Paramount+ page.
+Loads the saved page benchmarks/fixtures/paramount/event.html in headless
+Chrome and runs get_fights_on_page in both modes:
+  per-element  - find_elements, then href / parent / text per link
+  bulk         - one execute_script returning every {href, parentText}
+reporting WebDriver round trips and wall time, and checks both modes
+return the same fights.
+
+Needs selenium and Chrome, like scrape_paramount.py itself.
+
+Usage: python benchmarks/bench_extract.py [--runs N] [--driver PATH]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'paramount', 'event.html')
+sys.path.insert(0, ROOT)
+
+MODES = (('per-element', False), ('bulk', True))
+
+
+def count_round_trips(driver):
+    """Wrap driver.execute (every WebDriver command goes through it) with a counter"""
+    calls = [0]
+    execute = driver.execute
+
+    def counted(*args, **kwargs):
+        calls[0] += 1
+        return execute(*args, **kwargs)
+
+    driver.execute = counted
+    return calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=5, help='timed runs per mode')
+    parser.add_argument('--driver', help='chromedriver path (default: webdriver_manager)')
+    args = parser.parse_args()
+
+    import scrape_paramount
+
+    driver = scrape_paramount.setup_driver(args.driver)
+    try:
+        driver.get('file://' + os.path.abspath(FIXTURE))
+        calls = count_round_trips(driver)
+
+        print(f"{'mode':<14}{'fights':>8}{'round trips':>13}{'median ms':>11}")
+        outputs = {}
+        for name, bulk in MODES:
+            times = []
+            for _ in range(args.runs):
+                calls[0] = 0
+                start = time.perf_counter()
+                fights = scrape_paramount.get_fights_on_page(driver, bulk=bulk)
+                times.append(time.perf_counter() - start)
+            outputs[name] = fights
+            print(f"{name:<14}{len(fights):>8}{calls[0]:>13}{statistics.median(times) * 1000:>11.1f}")
+    finally:
+        driver.quit()
+
+    if outputs['bulk'] != outputs['per-element']:
+        print("MISMATCH between extraction modes")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Evaluate ParamountMatcher's fuzzy fallback on a labelled set.
+benchmarks/fixtures/paramount_fuzzy_eval.json holds fight lookups with
+names spelled differently from the Paramount+ titles (transliterations,
+typos, missing/extra middle names, accents) whose correct videos are
+known, plus lookups that must not match (fighters who never met on
+Paramount+, same-surname opponents). For exact matching alone and with
+the fuzzy fallback it reports precision, recall and per-lookup latency.
+
+Latency is the fastest of --repeat runs of each lookup, to keep
+scheduler noise out of the percentiles.
+
+Usage: python benchmarks/bench_fuzzy.py [--repeat N] [--show-misses]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+EVAL_SET = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'paramount_fuzzy_eval.json')
+sys.path.insert(0, ROOT)
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def evaluate(matcher, cases, fuzzy, repeat=5, show_misses=False):
+    tp = fp = fn = 0
+    latencies = []
+    by_kind = {}
+    for case in cases:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            url = matcher.find_match(case['fighter'], case['opponent'], case['event'], fuzzy=fuzzy)
+            timings.append(time.perf_counter() - start)
+        latencies.append(min(timings))
+
+        correct = url in case['expected'] if url else not case['expected']
+        kind = by_kind.setdefault(case['kind'], [0, 0])
+        kind[0] += correct
+        kind[1] += 1
+        if url and url in case['expected']:
+            tp += 1
+        elif url:
+            fp += 1
+        elif case['expected']:
+            fn += 1
+        if show_misses and not correct:
+            print(f"  miss [{case['kind']}] {case['fighter']} vs {case['opponent']} -> {url}")
+    return tp, fp, fn, latencies, by_kind
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs of each lookup')
+    parser.add_argument('--show-misses', action='store_true', help='print every wrong answer')
+    args = parser.parse_args()
+
+    from app import paramount
+
+    with open(EVAL_SET, 'r', encoding='utf-8') as f:
+        cases = json.load(f)
+    positives = sum(1 for case in cases if case['expected'])
+    print(f"{len(cases)} lookups, {positives} with a correct video\n")
+
+    results = {}
+    for label, fuzzy in (('exact only', False), ('exact + fuzzy', True)):
+        tp, fp, fn, latencies, by_kind = evaluate(paramount, cases, fuzzy, args.repeat, args.show_misses)
+        results[label] = by_kind
+        precision = tp / (tp + fp) if tp + fp else 0
+        recall = tp / positives if positives else 0
+        print(f"{label:<14} precision {precision:.3f}  recall {recall:.3f}  "
+              f"latency p50 {statistics.median(latencies) * 1e6:.0f}us  "
+              f"p99 {percentile(latencies, 99) * 1e6:.0f}us  max {max(latencies) * 1e6:.0f}us")
+
+    print(f"\n{'kind':<28}{'exact only':>12}{'exact + fuzzy':>15}")
+    for kind in sorted(results['exact only']):
+        exact_ok, total = results['exact only'][kind]
+        fuzzy_ok, _ = results['exact + fuzzy'][kind]
+        print(f"{kind:<28}{exact_ok:>7}/{total:<4}{fuzzy_ok:>10}/{total:<4}")
+
+
+if __name__ == '__main__':
+    main()
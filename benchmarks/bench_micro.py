@@ -0,0 +1,147 @@
+"""
+Micro-benchmarks for the request hot path, with machine-readable results.
+  find_match        - single lookups: database pairs (hits), pairs that
+                      never fought (misses) and misspelled names (fuzzy)
+  find_matches      - a whole fight history resolved in one call
+  normalize         - names.normalize, cold (memo cleared) and warm
+  parse_fight_title - every title in the golden corpus
+  extract           - fighter page / search page parsing with each backend
+
+Each case reports ops/s and per-call latency. Results go to
+benchmarks/results/ (or --output); compare two runs with results.py.
+
+Usage: python benchmarks/bench_micro.py [--repeat N] [--only CASE] [--output PATH]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+RESULTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+sys.path.insert(0, ROOT)
+
+from app import SOUP_PARSER, UFCFighterSearch, paramount  # noqa: E402
+from fight_titles import parse_fight_title  # noqa: E402
+import names  # noqa: E402
+from results import latency_summary, write_results  # noqa: E402
+
+
+def time_calls(fn, args_list, repeat):
+    """Time fn(*args) once per call; returns a result dict with ops/s and percentiles"""
+    durations = []
+    for _ in range(repeat):
+        for args in args_list:
+            start = time.perf_counter()
+            fn(*args)
+            durations.append(time.perf_counter() - start)
+    result = latency_summary(durations, unit='us')
+    result['ops_per_s'] = round(len(durations) / sum(durations), 1) if durations else 0.0
+    return result
+
+
+def time_batch(fn, items, repeat, setup=None):
+    """Time whole passes of fn over items, for calls too fast to time one by one"""
+    best = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {
+        'ops_per_s': round(len(items) / best, 1),
+        'mean_us': round(best / len(items) * 1000000, 4),
+        'samples': len(items),
+    }
+
+
+def matcher_cases(matcher, rng):
+    """(hits, misses, fuzzy) argument lists for find_match"""
+    fights = matcher.fights
+    hits = [(f.fighter1, f.fighter2, f.event) for f in fights]
+    fighters = sorted({f.fighter1 for f in fights} | {f.fighter2 for f in fights})
+    pairs = {(f.fighter1, f.fighter2) for f in fights} | {(f.fighter2, f.fighter1) for f in fights}
+    misses = []
+    while len(misses) < len(hits) // 2:
+        a, b = rng.sample(fighters, 2)
+        if (a, b) not in pairs:
+            misses.append((a, b, ''))
+    with open(os.path.join(FIXTURES, 'paramount_fuzzy_eval.json'), encoding='utf-8') as f:
+        fuzzy = [(case['fighter'], case['opponent'], case['event']) for case in json.load(f)]
+    return hits, misses, fuzzy
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return f.read()
+
+
+def extract_backends():
+    options = [('stream', 'stream'), ('html.parser', 'html.parser')]
+    if SOUP_PARSER == 'lxml':
+        options.append(('lxml', 'lxml'))
+    return options
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--only', help='run only cases whose name starts with this')
+    parser.add_argument('--seed', type=int, default=22)
+    parser.add_argument('--output', default=RESULTS, help='results file or directory')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    matcher = paramount
+    hits, misses, fuzzy = matcher_cases(matcher, rng)
+
+    with open(os.path.join(FIXTURES, 'paramount_titles.json'), encoding='utf-8') as f:
+        titles = [entry['title'] for entry in json.load(f)]
+    db_names = sorted({f.fighter1 for f in matcher.fights} | {f.fighter2 for f in matcher.fights})
+
+    long_page = fixture('fighter_long.html')
+    history = UFCFighterSearch(parser='stream').parse_fighter_fights(long_page)
+    history_args = [(name, [(fight['opponent'], fight['event']) for fight in history])
+                    for name in db_names[:200]]
+
+    cases = {
+        'find_match.hit': lambda: time_calls(matcher.find_match, hits, args.repeat),
+        'find_match.miss': lambda: time_calls(matcher.find_match, misses, args.repeat),
+        'find_match.fuzzy': lambda: time_calls(matcher.find_match, fuzzy, args.repeat),
+        'find_matches.history': lambda: time_calls(matcher.find_matches, history_args, args.repeat),
+        'normalize.cold': lambda: time_batch(names.normalize, db_names, args.repeat,
+                                             setup=names.normalize.cache_clear),
+        'normalize.warm': lambda: time_batch(names.normalize, db_names, args.repeat),
+        'parse_fight_title': lambda: time_batch(parse_fight_title, titles, args.repeat),
+    }
+    for label, backend in extract_backends():
+        search = UFCFighterSearch(parser=backend)
+        cases[f'extract.fighter_page.{label}'] = (
+            lambda search=search: time_calls(search.parse_fighter_fights, [(long_page,)], args.repeat * 10))
+        cases[f'extract.search_page.{label}'] = (
+            lambda search=search: time_calls(search.parse_fighter_list,
+                                             [(fixture('search_results.html'),)], args.repeat * 10))
+
+    results = {}
+    print(f"{'case':<34} {'ops/s':>12} {'mean':>10} {'p50':>10} {'p99':>10}")
+    for name, run in cases.items():
+        if args.only and not name.startswith(args.only):
+            continue
+        result = results[name] = run()
+        p50 = f"{result['p50_us']:.1f}us" if 'p50_us' in result else '-'
+        p99 = f"{result['p99_us']:.1f}us" if 'p99_us' in result else '-'
+        print(f"{name:<34} {result['ops_per_s']:>12,.0f} {result['mean_us']:>8.2f}us {p50:>10} {p99:>10}")
+
+    os.makedirs(RESULTS, exist_ok=True)
+    write_results(args.output, 'micro', {'repeat': args.repeat, 'seed': args.seed,
+                                         'fights': len(matcher.fights)}, results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark and check name normalization.
+Compares names.normalize (translate tables + NFKD, memoized) with the
+previous per-character replace + regex implementation, kept here as
+legacy_normalize, on every fighter name in paramount_fights.json, the
+fuzzy evaluation set and ufc_fighters.json (when built), plus a set of
+accented names.
+
+Names whose only non-ASCII letters were in the old 25-entry table must
+normalize exactly as before; the script exits 1 if any differ. Names
+with other accents are listed, since those are meant to change.
+
+Usage: python benchmarks/bench_normalize.py [--runs N]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+sys.path.insert(0, ROOT)
+
+import names
+
+LEGACY_REPLACEMENTS = {'é': 'e', 'è': 'e', 'ê': 'e', 'ë': 'e',
+                       'á': 'a', 'à': 'a', 'â': 'a', 'ã': 'a',
+                       'í': 'i', 'ì': 'i', 'î': 'i', 'ï': 'i',
+                       'ó': 'o', 'ò': 'o', 'ô': 'o', 'õ': 'o',
+                       'ú': 'u', 'ù': 'u', 'û': 'u', 'ü': 'u',
+                       'ñ': 'n', 'ç': 'c', 'ø': 'o', 'š': 's', 'ž': 'z'}
+
+ACCENTED = ['José Aldo', 'Jan Błachowicz', 'Jiří Procházka', 'Mateusz Gamrot', 'Joanna Jędrzejczyk',
+            'Khamzat Chimaev', 'Dominick Reyes', 'Ketlen Vieira', 'Zhang Weili', 'Rafael dos Anjos',
+            'Mauricio Rúa', 'Antônio Rodrigo Nogueira', 'Luboš Suda', 'Jiří Procházka Jr.', "Sean O'Malley",
+            'Benoît Saint Denis', 'Brian Ortega', 'Magomed Ankalaev', 'Marcin Tybura', 'Lukasz Brzeski',
+            'Michał Oleksiejczuk', 'Aleksandar Rakić', 'Gökhan Saki', 'Ciryl Gane', 'Nassourdine Imavov']
+
+
+def legacy_normalize(name):
+    name = name.lower().strip()
+    for k, v in LEGACY_REPLACEMENTS.items():
+        name = name.replace(k, v)
+    return re.sub(r'[^a-z0-9 ]', '', name)
+
+
+def load_names():
+    found = list(ACCENTED)
+    with open(os.path.join(ROOT, 'paramount_fights.json'), 'r', encoding='utf-8') as f:
+        for fight in json.load(f):
+            found += [fight.get('fighter1') or '', fight.get('fighter2') or '']
+    with open(os.path.join(FIXTURES, 'paramount_fuzzy_eval.json'), 'r', encoding='utf-8') as f:
+        for case in json.load(f):
+            found += [case['fighter'], case['opponent']]
+    directory = os.path.join(ROOT, 'ufc_fighters.json')
+    if os.path.exists(directory):
+        with open(directory, 'r', encoding='utf-8') as f:
+            found += [f"{first} {last}" for first, last, *_ in json.load(f)]
+    return found
+
+
+def names_per_sec(fn, corpus, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        for name in corpus:
+            fn(name)
+    return len(corpus) * runs / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=20, help='passes over the names when timing')
+    args = parser.parse_args()
+
+    corpus = load_names()
+    covered = set(LEGACY_REPLACEMENTS)
+    mismatches = 0
+    changed = []
+    for name in sorted(set(corpus)):
+        old = legacy_normalize(name)
+        new = names.normalize(name)
+        if old == new:
+            continue
+        if all(ch.isascii() or ch.lower() in covered for ch in name):
+            mismatches += 1
+            print(f"MISMATCH {name!r}: {old!r} -> {new!r}")
+        else:
+            changed.append((name, old, new))
+    print(f"{len(set(corpus))} distinct names, {mismatches} mismatches")
+    print(f"{len(changed)} names with accents the old table missed now normalize differently:")
+    for name, old, new in changed[:10]:
+        print(f"  {name!r}: {old!r} -> {new!r}")
+    if len(changed) > 10:
+        print(f"  ... and {len(changed) - 10} more")
+
+    uncached = names.normalize.__wrapped__
+    print(f"\n{'implementation':<22}{'names/sec':>14}")
+    print(f"{'legacy':<22}{names_per_sec(legacy_normalize, corpus, args.runs):>14,.0f}")
+    print(f"{'translate (no memo)':<22}{names_per_sec(uncached, corpus, args.runs):>14,.0f}")
+    names.normalize.cache_clear()
+    print(f"{'translate + memo':<22}{names_per_sec(names.normalize, corpus, args.runs):>14,.0f}")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
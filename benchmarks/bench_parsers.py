@@ -0,0 +1,90 @@
+"""
+Benchmark the HTML parser backends used by UFCFighterSearch.
+Parses the saved ufcstats pages in benchmarks/fixtures with every available
+backend, reports parse time and peak memory, and checks that each backend
+returns exactly the same fights / fighters as the original full
+html.parser tree.
+
+Usage: python benchmarks/bench_parsers.py [--repeat N]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import SOUP_PARSER, UFCFighterSearch  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def backends():
+    """(label, parser, strain) for every backend that can run here"""
+    options = [('html.parser (full tree)', 'html.parser', False),
+               ('html.parser + strainer', 'html.parser', True)]
+    if SOUP_PARSER == 'lxml':
+        options += [('lxml (full tree)', 'lxml', False),
+                    ('lxml + strainer', 'lxml', True)]
+    options.append(('stream extractor', 'stream', True))
+    return options
+
+
+def fixtures():
+    """(file name, content, parse method name) for each saved page"""
+    pages = []
+    for name in sorted(os.listdir(FIXTURES)):
+        if not name.endswith('.html'):
+            continue
+        with open(os.path.join(FIXTURES, name), 'rb') as f:
+            content = f.read()
+        method = 'parse_fighter_fights' if name.startswith('fighter') else 'parse_fighter_list'
+        pages.append((name, content, method))
+    return pages
+
+
+def measure(parse, content, repeat):
+    """Return (median seconds, peak bytes, result) for parse(content)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = parse(content)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    parse(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=20, help='timed runs per backend')
+    args = parser.parse_args()
+
+    mismatches = 0
+    for name, content, method in fixtures():
+        print(f"\n{name} ({len(content) // 1024} KB)")
+        print(f"  {'backend':<26}{'median ms':>10}{'peak KB':>10}{'rows':>6}")
+        baseline = None
+        for label, backend, strain in backends():
+            search = UFCFighterSearch(parser=backend, strain=strain)
+            seconds, peak, result = measure(getattr(search, method), content, args.repeat)
+            if baseline is None:
+                baseline = result
+            same = result == baseline
+            mismatches += not same
+            print(f"  {label:<26}{seconds * 1000:>10.2f}{peak // 1024:>10}{len(result):>6}"
+                  f"{'' if same else '  OUTPUT DIFFERS'}")
+
+    if mismatches:
+        print(f"\n{mismatches} backend result(s) differ from html.parser")
+        sys.exit(1)
+    print("\nAll backends returned identical results")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Run the Paramount+ scraper against a local fixture page.
+Serves benchmarks/fixtures/paramount/show.html from a local HTTP server,
+scrapes it with a real headless Chrome and checks every fight was found,
+then prints wall time and how long each kind of wait took.
+
+Needs selenium and Chrome, like scrape_paramount.py itself.
+
+Usage: python benchmarks/bench_scraper.py [--delay MS] [--jitter MS] [--driver PATH]
+"""
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'paramount')
+sys.path.insert(0, ROOT)
+
+# Fights per event on the fixture page (UFC 325, 324, 323)
+EXPECTED_FIGHTS = 9 + 11 + 14
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fixtures():
+    """Start a local server for the fixture pages; returns its base URL"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(QuietHandler, directory=FIXTURES))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--delay', type=int, default=400, help='fixture render delay in ms')
+    parser.add_argument('--jitter', type=int, default=200, help='extra random delay in ms')
+    parser.add_argument('--driver', help='chromedriver path (default: webdriver_manager)')
+    args = parser.parse_args()
+
+    import scrape_paramount
+
+    url = f"{serve_fixtures()}/show.html?delay={args.delay}&jitter={args.jitter}"
+    driver = scrape_paramount.setup_driver(args.driver)
+    try:
+        start = time.perf_counter()
+        fights = scrape_paramount.scrape_show_page(driver, url, 'Local fixture')
+        elapsed = time.perf_counter() - start
+    finally:
+        driver.quit()
+
+    print(f"\nScraped {len(fights)}/{EXPECTED_FIGHTS} fights in {elapsed:.1f}s")
+    print(scrape_paramount.pacing_report())
+    if len(fights) != EXPECTED_FIGHTS:
+        print("MISSING FIGHTS")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark Paramount+ database cold start.
+Compares, each in a fresh subprocess:
+  json-dicts  - json.load into a list of dicts (the original startup path)
+  json-index  - parse the JSON and build the matcher index from scratch
+  compiled    - load the compiled snapshot written by fight_db.py
+and reports load time plus the RSS and Python heap the loaded data keeps.
+
+Usage: python benchmarks/bench_startup.py [--runs N]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+MODES = ('json-dicts', 'json-index', 'compiled')
+
+
+def rss_kb():
+    """Current resident set size of this process, in KB (Linux)"""
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return 0
+
+
+def child(mode):
+    """Load the database one way and print the measurements as JSON"""
+    import gc
+    from app import ParamountMatcher
+    import fight_db
+
+    db_path = os.path.join(ROOT, 'paramount_fights.json')
+
+    def load():
+        if mode == 'json-dicts':
+            with open(db_path, 'r', encoding='utf-8') as f:
+                return [f for f in json.load(f) if f.get('fighter1') and f.get('fighter2')]
+        return ParamountMatcher(db_path, use_compiled=(mode == 'compiled'))
+
+    gc.collect()
+    rss_before = rss_kb()
+    start = time.perf_counter()
+    timed = load()
+    elapsed = time.perf_counter() - start
+    rss = rss_kb() - rss_before
+
+    # Second load under tracemalloc (which slows it down) just to size the heap
+    tracemalloc.start()
+    traced = load()
+    heap, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(json.dumps({'seconds': elapsed, 'heap_kb': heap // 1024, 'rss_kb': rss,
+                      'snapshot_kb': os.path.getsize(fight_db.compiled_path(db_path)) // 1024}))
+    return timed, traced
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=5, help='subprocesses per mode')
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+
+    # Build the compiled snapshot up front so no child pays for it
+    subprocess.run([sys.executable, os.path.join(ROOT, 'fight_db.py')], check=True, capture_output=True)
+
+    print(f"{'mode':<12}{'load ms':>10}{'heap KB':>10}{'RSS KB':>10}")
+    for mode in MODES:
+        results = []
+        for _ in range(args.runs):
+            out = subprocess.run([sys.executable, __file__, '--child', mode],
+                                 capture_output=True, text=True, check=True).stdout
+            results.append(json.loads(out.strip().splitlines()[-1]))
+        print(f"{mode:<12}"
+              f"{statistics.median(r['seconds'] for r in results) * 1000:>10.1f}"
+              f"{statistics.median(r['heap_kb'] for r in results):>10}"
+              f"{statistics.median(r['rss_kb'] for r in results):>10}")
+    print(f"\ncompiled snapshot size: {results[-1]['snapshot_kb']} KB")
+    print("(json-index heap leaves out names already interned by app's own matcher)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Check and benchmark the Paramount+ title parser.
+Parses every title in the golden corpus (benchmarks/fixtures/paramount_titles.json:
+all titles from paramount_fights.json plus the documented formats), compares
+fighter1/fighter2/event/card with the recorded answers, then reports
+titles/sec and how many titles each rule parsed.
+
+Exits 1 if any title parses differently. After an intended rule change,
+record the new answers with --update.
+
+Usage: python benchmarks/bench_titles.py [--runs N] [--update]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+GOLDEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'paramount_titles.json')
+sys.path.insert(0, ROOT)
+
+import fight_titles
+
+FIELDS = ('fighter1', 'fighter2', 'event', 'card')
+
+
+def parse(title):
+    parsed = fight_titles.parse_fight_title(title)
+    return {field: parsed[field] for field in FIELDS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=20, help='passes over the corpus when timing')
+    parser.add_argument('--update', action='store_true', help='rewrite the golden corpus with current output')
+    args = parser.parse_args()
+
+    with open(GOLDEN, 'r', encoding='utf-8') as f:
+        golden = json.load(f)
+    titles = [entry['title'] for entry in golden]
+
+    if args.update:
+        with open(GOLDEN, 'w', encoding='utf-8') as f:
+            json.dump([{'title': title, **parse(title)} for title in titles], f, indent=1, ensure_ascii=False)
+            f.write('\n')
+        print(f"Updated {len(titles)} golden titles")
+        return
+
+    mismatches = 0
+    for entry in golden:
+        got = parse(entry['title'])
+        expected = {field: entry[field] for field in FIELDS}
+        if got != expected:
+            mismatches += 1
+            print(f"MISMATCH {entry['title']!r}\n  expected {expected}\n  got      {got}")
+    print(f"{len(golden) - mismatches}/{len(golden)} golden titles match")
+
+    for rule in fight_titles.RULES:
+        rule.hits = 0
+    start = time.perf_counter()
+    for _ in range(args.runs):
+        for title in titles:
+            fight_titles.parse_fight_title(title)
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(titles) * args.runs / elapsed:,.0f} titles/sec")
+    for name, hits in fight_titles.rule_hits().items():
+        print(f"  {name:<16}{hits // args.runs:>6} per pass")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,298 @@
+"""
+End-to-end load test against a local ufcstats.com stand-in.
+Starts benchmarks/stub_ufcstats.py and the app (werkzeug threaded server,
+or uvicorn on asgi.py) on free ports, then runs simulated users. Each user
+types a fighter name a key at a time, and like static/script.js only
+searches once typing pauses for 300ms (and the query has 2+ characters).
+They then open the first result's fight history from /api/fights/stream,
+reading the NDJSON to the end like the page does, and click through to a
+few Paramount+ links before thinking and starting over.
+
+Reports throughput and p50/p95/p99 per endpoint (for the stream, both the
+whole response and the time to its first fight), plus the server's own
+per-stage means from /metrics. Results go to benchmarks/results/ (or
+--output); compare two runs with results.py.
+
+Usage: python benchmarks/load_test.py [--users N] [--duration S] [--latency MS]
+                                      [--error-rate F] [--server werkzeug|uvicorn]
+                                      [--target URL] [--output PATH]
+"""
+import argparse
+from collections import Counter, defaultdict
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+HERE = os.path.dirname(os.path.abspath(__file__))
+RESULTS = os.path.join(HERE, 'results')
+sys.path.insert(0, HERE)
+
+from results import latency_summary, write_results  # noqa: E402
+
+# Matches the autocomplete in static/script.js
+DEBOUNCE = 0.3
+MIN_QUERY = 2
+
+STREAM = '/api/fights/stream'
+FIRST_FIGHT = STREAM + ' first'
+ENDPOINTS = ('/api/search', STREAM, FIRST_FIGHT, '/api/paramount-link')
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_for(url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.1)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+
+def start_processes(args):
+    """Start the stub and the app. Returns (app base URL, processes)"""
+    stub_port = free_port()
+    stub = subprocess.Popen([sys.executable, os.path.join(HERE, 'stub_ufcstats.py'),
+                             '--port', str(stub_port), '--latency', str(args.latency),
+                             '--jitter', str(args.jitter), '--error-rate', str(args.error_rate),
+                             '--seed', str(args.seed)],
+                            stdout=subprocess.DEVNULL)
+    stub_url = f"http://127.0.0.1:{stub_port}"
+
+    app_port = free_port()
+    env = dict(os.environ, UFC_STATS_URL=stub_url)
+    if args.server == 'uvicorn':
+        command = [sys.executable, '-m', 'uvicorn', 'asgi:application', '--port', str(app_port),
+                   '--log-level', 'warning']
+    else:
+        command = [sys.executable, '-c',
+                   'from werkzeug.serving import run_simple; import app; app.start_background_tasks(); '
+                   f'run_simple("127.0.0.1", {app_port}, app.app, threaded=True)']
+    server = subprocess.Popen(command, cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    app_url = f"http://127.0.0.1:{app_port}"
+    wait_for(stub_url + '/statistics/fighters')
+    wait_for(app_url + '/metrics')
+    return app_url, [server, stub]
+
+
+def popular_names():
+    """Fighter names from the Paramount+ database, weighted by how often they appear"""
+    with open(os.path.join(ROOT, 'paramount_fights.json'), encoding='utf-8') as f:
+        fights = json.load(f)
+    counts = Counter()
+    for fight in fights:
+        for key in ('fighter1', 'fighter2'):
+            if fight.get(key):
+                counts[fight[key]] += 1
+    return list(counts), list(counts.values())
+
+
+def keystroke_gaps(rng, length):
+    """Seconds between each keystroke of a name and the next: mostly quick, sometimes a pause"""
+    gaps = []
+    for _ in range(length):
+        if rng.random() < 0.1:
+            gaps.append(rng.uniform(0.4, 1.2))
+        else:
+            gaps.append(min(0.6, max(0.04, rng.gauss(0.15, 0.05))))
+    return gaps
+
+
+class User(threading.Thread):
+    """One simulated visitor, looping search -> fight history -> Paramount+ links"""
+
+    def __init__(self, number, base_url, args, names, weights, stats):
+        super().__init__(name=f'user-{number}', daemon=True)
+        self.base_url = base_url
+        self.args = args
+        self.names = names
+        self.weights = weights
+        self.stats = stats
+        self.rng = random.Random(args.seed * 1000 + number)
+        self.session = requests.Session()
+        self.deadline = time.time() + args.duration
+
+    def sleep(self, seconds):
+        time.sleep(seconds * self.args.time_scale)
+
+    def get(self, path, params):
+        start = time.perf_counter()
+        try:
+            response = self.session.get(self.base_url + path, params=params, timeout=30)
+            status = response.status_code
+            data = response.json() if status == 200 else None
+        except (requests.RequestException, ValueError):
+            status, data = 'error', None
+        self.stats.record(path, time.perf_counter() - start, status)
+        return data
+
+    def get_fights(self, params):
+        """Read /api/fights/stream to the end, as static/script.js does.
+        Records the whole response, and separately the time to the first fight.
+        """
+        start = time.perf_counter()
+        fights = []
+        try:
+            with self.session.get(self.base_url + STREAM, params=params, timeout=30,
+                                  stream=True) as response:
+                status = response.status_code
+                for line in response.iter_lines() if status == 200 else ():
+                    if not line:
+                        continue
+                    message = json.loads(line)
+                    if 'fight' in message:
+                        if not fights:
+                            self.stats.record(FIRST_FIGHT, time.perf_counter() - start, status)
+                        fights.append(message['fight'])
+                    elif 'error' in message:
+                        status = 'error'
+        except (requests.RequestException, ValueError):
+            status = 'error'
+        self.stats.record(STREAM, time.perf_counter() - start, status)
+        return fights
+
+    def type_and_search(self, name):
+        """Type name with realistic gaps; search whenever the debounce fires"""
+        data = None
+        gaps = keystroke_gaps(self.rng, len(name))
+        for i, gap in enumerate(gaps):
+            query = name[:i + 1]
+            last = i == len(name) - 1
+            if len(query) >= MIN_QUERY and (gap >= DEBOUNCE or last):
+                self.sleep(DEBOUNCE)
+                start = time.perf_counter()
+                data = self.get('/api/search', {'name': query})
+                # The user kept typing while the request was in flight
+                self.sleep(max(0.0, gap - DEBOUNCE - (time.perf_counter() - start)))
+            else:
+                self.sleep(gap)
+        return data
+
+    def run(self):
+        while time.time() < self.deadline:
+            name = self.rng.choices(self.names, self.weights)[0]
+            data = self.type_and_search(name)
+            fighters = (data or {}).get('fighters') or []
+            if fighters:
+                fighter = fighters[0]
+                self.sleep(self.rng.uniform(0.3, 1.0))
+                fights = self.get_fights({'url': fighter['url'], 'name': fighter['name']})
+                for fight in self.rng.sample(fights, min(len(fights), self.rng.randint(1, 3))):
+                    self.sleep(self.rng.uniform(0.5, 2.0))
+                    self.get('/api/paramount-link', {'fighter': fighter['name'],
+                                                     'opponent': fight['opponent'],
+                                                     'event': fight['event']})
+            self.sleep(self.rng.uniform(1.0, 3.0))
+
+
+class Stats:
+    """Latencies and status codes per endpoint, shared by all users"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    def record(self, path, seconds, status):
+        with self.lock:
+            self.latencies[path].append(seconds)
+            self.statuses[path][status] += 1
+
+
+def server_stages(base_url):
+    """Mean seconds per request stage, read from the app's /metrics"""
+    try:
+        text = requests.get(base_url + '/metrics', timeout=5).text
+    except requests.RequestException:
+        return {}
+    sums = dict(re.findall(r'^ufc_stage_seconds_sum\{stage="([^"]+)"\} (\S+)$', text, re.M))
+    counts = dict(re.findall(r'^ufc_stage_seconds_count\{stage="([^"]+)"\} (\S+)$', text, re.M))
+    return {stage: {'mean_ms': round(float(sums[stage]) / float(counts[stage]) * 1000, 3),
+                    'count': int(float(counts[stage]))}
+            for stage in sums if float(counts.get(stage, 0))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end load test against a stub ufcstats.com')
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--duration', type=float, default=30, help='seconds')
+    parser.add_argument('--time-scale', type=float, default=1.0,
+                        help='multiply typing and think time by this (0.1 = 10x faster users)')
+    parser.add_argument('--latency', type=float, default=150, help='stub response delay in ms')
+    parser.add_argument('--jitter', type=float, default=100, help='stub delay noise in ms')
+    parser.add_argument('--error-rate', type=float, default=0.01, help='fraction of stub replies that are 503')
+    parser.add_argument('--server', choices=('werkzeug', 'uvicorn'), default='werkzeug')
+    parser.add_argument('--target', help='drive an already running app at this URL instead')
+    parser.add_argument('--seed', type=int, default=22)
+    parser.add_argument('--output', default=RESULTS, help='results file or directory')
+    args = parser.parse_args()
+
+    processes = []
+    if args.target:
+        base_url = args.target.rstrip('/')
+    else:
+        base_url, processes = start_processes(args)
+
+    try:
+        names, weights = popular_names()
+        stats = Stats()
+        users = [User(i, base_url, args, names, weights, stats) for i in range(args.users)]
+        start = time.perf_counter()
+        for user in users:
+            user.start()
+        for user in users:
+            user.join()
+        elapsed = time.perf_counter() - start
+        stages = server_stages(base_url)
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+    results = {}
+    total = sum(len(stats.latencies[path]) for path in ENDPOINTS if path != FIRST_FIGHT)
+    print(f"{total} requests in {elapsed:.1f}s from {args.users} users ({total / elapsed:.1f} req/s)\n")
+    print(f"{'endpoint':<25} {'requests':>9} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'errors':>7}")
+    for path in ENDPOINTS:
+        latencies = stats.latencies[path]
+        statuses = stats.statuses[path]
+        summary = latency_summary(latencies)
+        summary['requests_per_s'] = round(len(latencies) / elapsed, 2)
+        summary['errors'] = sum(count for status, count in statuses.items() if status != 200)
+        summary['statuses'] = {str(status): count for status, count in statuses.items()}
+        results[path] = summary
+        print(f"{path:<25} {len(latencies):>9} {summary['requests_per_s']:>8.1f} "
+              f"{summary['p50_ms']:>7.1f}ms {summary['p95_ms']:>7.1f}ms {summary['p99_ms']:>7.1f}ms "
+              f"{summary['errors']:>7}")
+    results['total'] = {'requests_per_s': round(total / elapsed, 2), 'samples': total}
+
+    if stages:
+        print("\nServer stages (mean per call):")
+        for stage, values in sorted(stages.items()):
+            print(f"  {stage:<16} {values['mean_ms']:>8.3f}ms  x{values['count']}")
+            results[f'stage.{stage}'] = values
+
+    config = {key: value for key, value in vars(args).items() if key != 'output'}
+    os.makedirs(RESULTS, exist_ok=True)
+    write_results(args.output, 'load', config, results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Machine-readable benchmark results, so runs can be compared.
+bench_micro.py and load_test.py write one JSON file per run:
+
+  {"suite": ..., "started": ..., "git": ..., "python": ..., "config": {...},
+   "results": {"<case>": {"<metric>": number, ...}, ...}}
+
+Metric names say which way is better: *_per_s is higher-is-better, *_ms and
+*_us are lower-is-better; anything else is informational.
+
+Compare two runs (exits 1 if any metric regressed by more than the threshold):
+  python benchmarks/results.py OLD.json NEW.json [--threshold 10]
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[rank]
+
+
+def latency_summary(seconds, unit='ms'):
+    """p50/p95/p99/max/mean of a list of durations in seconds, in ms or us"""
+    scale = 1000 if unit == 'ms' else 1000000
+    values = sorted(seconds)
+    summary = {f'{name}_{unit}': round(percentile(values, pct) * scale, 3)
+               for name, pct in (('p50', 50), ('p95', 95), ('p99', 99))}
+    summary[f'max_{unit}'] = round(values[-1] * scale, 3) if values else 0.0
+    summary[f'mean_{unit}'] = round(sum(values) / len(values) * scale, 3) if values else 0.0
+    summary['samples'] = len(values)
+    return summary
+
+
+def git_revision():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                             capture_output=True, text=True, timeout=10)
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                               capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return 'unknown'
+    revision = out.stdout.strip() or 'unknown'
+    return revision + ('-dirty' if dirty.stdout.strip() else '')
+
+
+def write_results(path, suite, config, results):
+    """Write one run to path (a directory gets a timestamped file). Returns the file path"""
+    started = time.strftime('%Y-%m-%dT%H:%M:%S')
+    if os.path.isdir(path):
+        path = os.path.join(path, f"{suite}-{started.replace(':', '')}.json")
+    run = {
+        'suite': suite,
+        'started': started,
+        'git': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': config,
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(run, f, indent=2, sort_keys=True)
+    print(f"Results written to {path}")
+    return path
+
+
+def direction(metric):
+    """+1 if higher is better, -1 if lower is better, 0 if neither"""
+    if metric.endswith('_per_s'):
+        return 1
+    if metric.endswith('_ms') or metric.endswith('_us'):
+        return -1
+    return 0
+
+
+def compare(old, new, threshold):
+    """Print metric changes between two runs; returns how many regressed"""
+    regressions = 0
+    print(f"{'case':<34} {'metric':<14} {'old':>12} {'new':>12} {'change':>9}")
+    for case, metrics in new['results'].items():
+        before = old['results'].get(case, {})
+        for metric, value in metrics.items():
+            better = direction(metric)
+            if not better or metric not in before or not isinstance(value, (int, float)):
+                continue
+            base = before[metric]
+            change = (value - base) / base * 100 if base else 0.0
+            worse = -change * better > threshold
+            regressions += worse
+            flag = '  REGRESSION' if worse else ''
+            print(f"{case:<34} {metric:<14} {base:>12.3f} {value:>12.3f} {change:>+8.1f}%{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare two benchmark result files')
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='percent change that counts as a regression (default 10)')
+    args = parser.parse_args()
+
+    with open(args.old, encoding='utf-8') as f:
+        old = json.load(f)
+    with open(args.new, encoding='utf-8') as f:
+        new = json.load(f)
+    if old['suite'] != new['suite']:
+        print(f"Warning: comparing a {old['suite']} run with a {new['suite']} run")
+    print(f"{old['git']} ({old['started']}) -> {new['git']} ({new['started']})\n")
+
+    regressions = compare(old, new, args.threshold)
+    print(f"\n{regressions} regression(s) over {args.threshold:g}%")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
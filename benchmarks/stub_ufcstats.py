@@ -0,0 +1,148 @@
+"""
+Local stand-in for ufcstats.com, for load tests and benchmarks.
+Replays the saved pages in benchmarks/fixtures with configurable latency
+and error rate:
+
+  /statistics/fighters/search?query=...  search_results.html
+  /statistics/fighters?char=...          search_results.html
+  /fighter-details/<id>                  fighter_long.html or fighter_short.html
+  /event-details/<id>                    a small event page with a location
+
+Links in the pages point back at the stub, so fighter URLs returned by
+/api/search can be fed straight to /api/fights. Pages carry an ETag and
+If-None-Match gets a 304, like the real site.
+
+Point the app at it with UFC_STATS_URL:
+  python benchmarks/stub_ufcstats.py --port 8765 --latency 150 --jitter 100 --error-rate 0.01
+  UFC_STATS_URL=http://127.0.0.1:8765 python app.py
+"""
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+import zlib
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+EVENT_PAGE = b"""<html><body><ul class="b-list__box-list">
+<li class="b-list__box-list-item"><i class="b-list__box-item-title">Date:</i> March 02, 2024</li>
+<li class="b-list__box-list-item"><i class="b-list__box-item-title">Location:</i> Las Vegas, Nevada, USA</li>
+</ul></body></html>"""
+
+
+class StubConfig:
+    """Replayed pages, injected latency/errors and request counters"""
+
+    def __init__(self, base_url, latency=0.0, jitter=0.0, error_rate=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'errors': 0, 'not_modified': 0}
+
+        def page(name):
+            with open(os.path.join(FIXTURES, name), 'rb') as f:
+                return f.read().replace(b'http://ufcstats.com', base_url.encode())
+
+        self.search = page('search_results.html')
+        self.fighters = [page('fighter_short.html'), page('fighter_long.html')]
+
+    def delay(self):
+        with self.lock:
+            delay = self.latency + self.random.uniform(-self.jitter, self.jitter)
+            fail = self.random.random() < self.error_rate
+        return max(0.0, delay), fail
+
+    def page_for(self, path):
+        if path in ('/statistics/fighters/search', '/statistics/fighters'):
+            return self.search
+        if path.startswith('/fighter-details/'):
+            # Same fighter, same page: pick by a hash of the id
+            return self.fighters[zlib.crc32(path.encode()) % len(self.fighters)]
+        if path.startswith('/event-details/'):
+            return EVENT_PAGE
+        return None
+
+    def count(self, stat):
+        with self.lock:
+            self.stats[stat] += 1
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        config = self.server.config
+        config.count('requests')
+        delay, fail = config.delay()
+        time.sleep(delay)
+
+        if fail:
+            config.count('errors')
+            self.reply(503, b'Service Unavailable')
+            return
+
+        body = config.page_for(urlsplit(self.path).path)
+        if body is None:
+            self.reply(404, b'Not Found')
+            return
+
+        etag = f'"{zlib.crc32(body):08x}"'
+        if self.headers.get('If-None-Match') == etag:
+            config.count('not_modified')
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.reply(200, body, etag)
+
+    def reply(self, status, body, etag=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub(port=0, latency=0.0, jitter=0.0, error_rate=0.0, seed=None, host='127.0.0.1'):
+    """Serve the stub from a background thread. Returns the server; its url is server.base_url"""
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    server.base_url = f"http://{host}:{server.server_address[1]}"
+    server.config = StubConfig(server.base_url, latency, jitter, error_rate, seed)
+    threading.Thread(target=server.serve_forever, name='stub-ufcstats', daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in for ufcstats.com')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0, help='mean response delay in ms')
+    parser.add_argument('--jitter', type=float, default=0, help='+/- this many ms of uniform noise')
+    parser.add_argument('--error-rate', type=float, default=0, help='fraction of requests answered 503')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    server = start_stub(args.port, args.latency / 1000, args.jitter / 1000, args.error_rate,
+                        args.seed, args.host)
+    print(f"Stub ufcstats.com at {server.base_url} "
+          f"(latency {args.latency:g}±{args.jitter:g}ms, error rate {args.error_rate:g})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print(f"Served {server.config.stats}")
+
+
+if __name__ == '__main__':
+    main()
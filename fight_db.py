@@ -0,0 +1,79 @@
+"""
+Compiled, fast-loading form of paramount_fights.json.
+The JSON file stays the source of truth (scrape_paramount.py writes it).
+This module turns it into FightRecord tuples with interned strings and
+saves a compiled snapshot of the matcher's index next to it, so a worker
+can start by unpickling ready-made lookup tables instead of parsing JSON
+and normalizing every name again.
+
+The trade-off: loading the snapshot takes about as long as json.load of
+the bare file did, and far less than building the index, but the loaded
+index (lookup tables plus the precomputed availability map) takes roughly
+twice the memory of the plain list of dicts. Posting lists are stored as
+tuples and pair keys as flat tuples to keep that down.
+
+Build it explicitly with: python fight_db.py
+(the app also rebuilds it on startup whenever the JSON file changes)
+"""
+from collections import namedtuple
+import json
+import os
+import pickle
+import sys
+
+# Bump when the compiled layout changes so stale files are rebuilt
+FORMAT_VERSION = 4
+
+FightRecord = namedtuple('FightRecord', ['code', 'url', 'title', 'fighter1', 'fighter2', 'event', 'card'])
+
+
+def compiled_path(json_path):
+    """Where the compiled snapshot for a JSON database lives"""
+    return os.path.splitext(json_path)[0] + '.idx'
+
+
+def source_stamp(json_path):
+    """Size and mtime of the JSON file, used to tell if a snapshot is stale"""
+    st = os.stat(json_path)
+    return (st.st_size, st.st_mtime_ns)
+
+
+def read_json(json_path):
+    """Load the scraped JSON as FightRecords, skipping entries without both fighters"""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        rows = json.load(f)
+    # Event, card and fighter names repeat a lot; intern them so each is stored once
+    return [
+        FightRecord(*(sys.intern(row.get(field) or '') for field in FightRecord._fields))
+        for row in rows
+        if row.get('fighter1') and row.get('fighter2')
+    ]
+
+
+def save(path, stamp, state):
+    """Write a compiled snapshot atomically (temp file + rename)"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({'version': FORMAT_VERSION, 'stamp': stamp, 'state': state}, f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def load(path, stamp):
+    """Return the saved state if the snapshot exists and matches stamp, else None"""
+    try:
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+    if data.get('version') != FORMAT_VERSION or tuple(data.get('stamp', ())) != tuple(stamp):
+        return None
+    return data['state']
+
+
+if __name__ == '__main__':
+    from app import ParamountMatcher
+
+    matcher = ParamountMatcher(use_compiled=False)
+    matcher.save_compiled()
+    print(f"Compiled {len(matcher.fights)} fights to {compiled_path(matcher.db_path)}")
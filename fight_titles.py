@@ -0,0 +1,191 @@
+"""
+Parse Paramount+ video titles into fighters, event and card.
+Each title format is a rule: a precompiled pattern, a cheap substring check
+that must hold for the pattern to match, and a function filling in the
+result. Rules are tried most common first, but when several match, the one
+earliest in the original order (FORMAT 1..6) wins, as it always has.
+
+Re-parse the whole database after changing rules with: python fight_titles.py
+"""
+import json
+import os
+import re
+
+SUBSCRIBE = re.compile(r'^SUBSCRIBE\s*')
+EVENT_NAME = re.compile(r'(UFC\s+\d+|UFC Fight Night[^:]*)')
+
+
+class TitleRule:
+    """One title format: prefilter, pattern and how to read its groups"""
+    __slots__ = ('name', 'precedence', 'applies', 'pattern', 'build', 'hits')
+
+    def __init__(self, name, precedence, applies, pattern, build):
+        self.name = name
+        self.precedence = precedence
+        self.applies = applies
+        self.pattern = re.compile(pattern)
+        self.build = build
+        self.hits = 0
+
+
+def build_bracketed(result, match, title):
+    result['fighter1'] = match.group(1).strip()
+    result['fighter2'] = match.group(2).strip()
+    event_part = match.group(3).strip()
+    if ' - ' in event_part:
+        parts = event_part.rsplit(' - ', 1)
+        result['event'] = parts[0].strip()
+        result['card'] = parts[1].strip()
+    else:
+        result['event'] = event_part
+
+
+def build_numbered(result, match, title):
+    result['event'] = f"UFC {match.group(1)}"
+    result['fighter1'] = match.group(2).strip()
+    result['fighter2'] = match.group(3).strip()
+    result['card'] = match.group(4).strip() if match.group(4) else ''
+
+
+def build_ufc_numbered(result, match, title):
+    result['event'] = match.group(1).strip()
+    result['fighter1'] = match.group(2).strip()
+    result['fighter2'] = match.group(3).strip()
+    result['card'] = match.group(4).strip() if match.group(4) else ''
+
+
+def build_watch_showdown(result, match, title):
+    result['fighter1'] = match.group(1).strip()
+    result['fighter2'] = match.group(2).strip()
+    # Try to get event name
+    evt = EVENT_NAME.search(title)
+    if evt:
+        result['event'] = evt.group(1).strip()
+
+
+def build_watch_bout(result, match, title):
+    result['fighter1'] = match.group(1).strip()
+    result['fighter2'] = match.group(2).strip()
+    result['event'] = match.group(3).strip()
+
+
+def build_simple(result, match, title):
+    result['fighter1'] = match.group(1).strip()
+    result['fighter2'] = match.group(2).strip()
+
+
+# Every pattern needs "vs", which parse_fight_title checks once up front
+RULES_BY_PRECEDENCE = [
+    # FORMAT 1: "Fighter1 vs. Fighter2 (Event - Card)"
+    TitleRule('bracketed', 0, lambda t: '(' in t,
+              r'(.+?)\s+vs\.?\s+(.+?)\s*\((.+?)\)', build_bracketed),
+    # FORMAT 2: "323: Fighter vs. Fighter Main Card/Prelims"
+    TitleRule('numbered', 1, lambda t: t[:1].isdigit(),
+              r'^(\d+):\s+(.+?)\s+vs\.?\s+(.+?)(?:\s+(Main Card|Prelims|Early Prelims))?\s*$', build_numbered),
+    # FORMAT 3: "UFC 307: Fighter vs. Fighter Main Card/Prelims"
+    TitleRule('ufc_numbered', 2, lambda t: t.startswith('UFC'),
+              r'^(UFC\s+\d+):\s+(.+?)\s+vs\.?\s+(.+?)(?:\s+(Main Card|Prelims|Early Prelims))?\s*$', build_ufc_numbered),
+    # FORMAT 4: "Watch the UFC NNN showdown between Fighter1 vs. Fighter2 streamed on..."
+    TitleRule('watch_showdown', 3, lambda t: t.startswith('Watch the '),
+              r'Watch the (?:UFC\s+\d+\s+showdown between\s+)?(.+?)\s+vs\.?\s+(.+?)\s+(?:bout\s+from\s+|streamed\s+on)',
+              build_watch_showdown),
+    # FORMAT 5: "Watch the Fighter1 vs. Fighter2 bout from EVENT from DATE in LOCATION"
+    TitleRule('watch_bout', 4, lambda t: t.startswith('Watch the'),
+              r'Watch the\s+(.+?)\s+vs\.?\s+(.+?)\s+bout\s+from\s+(.+?)(?:\s+from\s+|\s+streamed)', build_watch_bout),
+    # FORMAT 6: Simple "Fighter1 vs. Fighter2"
+    TitleRule('simple', 5, lambda t: True,
+              r'^(.+?)\s+vs\.?\s+(.+?)$', build_simple),
+]
+
+# Order tried in, by how often each format wins in paramount_fights.json
+# (numbered 543, ufc_numbered 366, simple 132, bracketed 61, watch_* 4)
+RULES = [RULES_BY_PRECEDENCE[i] for i in (1, 2, 5, 0, 3, 4)]
+
+
+def parse_fight_title(title):
+    """Parse a fight title into structured data.
+    Handles multiple formats:
+    1. 'Alexander Volkanovski vs. Diego Lopes (UFC 325: ... - Main)'
+    2. '323: Blachowicz vs. Guskov Main Card'
+    3. 'UFC 307: Ketlen Vieira vs. Kayla Harrison Main Card'
+    4. 'Watch the UFC 313 showdown between Joshua Van vs. Rei Tsuruya streamed on ...'
+    5. 'Watch the Alexandre Pantoja vs. Yuta Sasaki bout from UFC Fight Night...'
+    6. 'Diego Lopes vs. Jean Silva'
+    7. 'UFC 110: Cain Velasquez vs. Antonio Rodrigo Nogueira'
+    """
+    result = {
+        'fighter1': '',
+        'fighter2': '',
+        'event': '',
+        'card': '',
+        'raw': title
+    }
+
+    # Remove "SUBSCRIBE" prefix
+    if title.startswith('SUBSCRIBE'):
+        title = SUBSCRIBE.sub('', title)
+    title = title.strip()
+
+    # Skip event recaps and non-fight content, and anything no rule can match
+    if 'Event Recap' in title or 'Storylines' in title or 'Breakdown' in title or 'vs' not in title:
+        return result
+
+    tried = []
+    for rule in RULES:
+        if not rule.applies(title):
+            continue
+        match = rule.pattern.match(title)
+        if not match:
+            tried.append(rule)
+            continue
+        # A format earlier in the original order still wins if it also matches
+        for earlier in RULES_BY_PRECEDENCE[:rule.precedence]:
+            if earlier in tried or not earlier.applies(title):
+                continue
+            earlier_match = earlier.pattern.match(title)
+            if earlier_match:
+                rule, match = earlier, earlier_match
+                break
+        rule.hits += 1
+        rule.build(result, match, title)
+        return result
+
+    return result
+
+
+def rule_hits():
+    """How many titles each rule has parsed, most common first"""
+    return {rule.name: rule.hits for rule in sorted(RULES, key=lambda rule: -rule.hits)}
+
+
+def reparse_database(path='paramount_fights.json'):
+    """Re-parse every title in the database, replacing the file atomically
+    (temp file + rename) so the app's hot reload never sees half of it.
+    Returns how many entries changed.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        fights = json.load(f)
+
+    changed = 0
+    for fight in fights:
+        parsed = parse_fight_title(fight['title'])
+        fields = {key: parsed[key] for key in ('fighter1', 'fighter2', 'event', 'card')}
+        if any(fight.get(key) != value for key, value in fields.items()):
+            fight.update(fields)
+            changed += 1
+
+    if changed:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(fights, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    return changed
+
+
+if __name__ == '__main__':
+    changed = reparse_database()
+    print(f"Re-parsed titles, {changed} entries changed")
+    for name, hits in rule_hits().items():
+        print(f"  {name}: {hits}")
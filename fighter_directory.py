@@ -0,0 +1,236 @@
+"""
+Offline UFC fighter directory for autocomplete.
+Crawls the ufcstats.com A-Z fighter listing once, saves it as a compact
+JSON file and answers searches from an in-memory prefix/trigram index
+instead of scraping ufcstats.com on every keystroke. A new directory is
+only searched (and saved) once every letter has been crawled; after that
+the background refresh keeps it up to date a letter at a time.
+"""
+from bisect import bisect_left
+import json
+import os
+import string
+import threading
+import time
+
+import names
+
+FIGHTER_URL = "http://ufcstats.com/fighter-details/"
+
+
+class DirectoryIndex:
+    """Immutable search index over a list of fighter records"""
+
+    def __init__(self, fighters, normalize):
+        self.fighters = fighters
+        self.keys = []        # per fighter: (normalized name, normalized last name, total fights)
+        token_pairs = []      # (token, fighter index), sorted for prefix lookups
+        self.trigrams = {}    # trigram -> [fighter index]
+
+        for idx, fighter in enumerate(fighters):
+            name = normalize(fighter['name'])
+            last = normalize(fighter['last'])
+            total = sum(int(n) for n in fighter['record'].split('-') if n.isdigit())
+            self.keys.append((name, last, total))
+
+            tokens = set(name.split()) | set(normalize(fighter['nickname']).split())
+            token_pairs.extend((token, idx) for token in tokens)
+
+            padded = f" {name} "
+            for gram in {padded[i:i + 3] for i in range(len(padded) - 2)}:
+                self.trigrams.setdefault(gram, []).append(idx)
+
+        token_pairs.sort()
+        self.tokens = [token for token, _ in token_pairs]
+        self.token_ids = [idx for _, idx in token_pairs]
+
+    def prefix_ids(self, prefix):
+        """Return the set of fighters with a name token starting with prefix"""
+        ids = set()
+        pos = bisect_left(self.tokens, prefix)
+        while pos < len(self.tokens) and self.tokens[pos].startswith(prefix):
+            ids.add(self.token_ids[pos])
+            pos += 1
+        return ids
+
+    def rank(self, ids, query, tokens):
+        """Order prefix matches: exact name, name prefix, last-name prefix, then most fights"""
+        def key(idx):
+            name, last, total = self.keys[idx]
+            return (name != query, not name.startswith(query),
+                    not last.startswith(tokens[-1]), -total, name)
+        return sorted(ids, key=key)
+
+    def fuzzy_ids(self, query, min_score=0.4):
+        """Rank fighters by trigram similarity to query (for typos)"""
+        padded = f" {query} "
+        grams = {padded[i:i + 3] for i in range(len(padded) - 2)}
+        overlap = {}
+        for gram in grams:
+            for idx in self.trigrams.get(gram, ()):
+                overlap[idx] = overlap.get(idx, 0) + 1
+
+        scored = []
+        for idx, shared in overlap.items():
+            name_grams = len(self.keys[idx][0]) + 1
+            score = 2 * shared / (len(grams) + name_grams)
+            if score >= min_score:
+                scored.append((-score, -self.keys[idx][2], idx))
+        scored.sort()
+        return [idx for _, _, idx in scored]
+
+
+class FighterDirectory:
+    """Local copy of the ufcstats.com fighter list with fast search"""
+
+    def __init__(self, path=None, normalize=None):
+        self.path = path or os.path.join(os.path.dirname(__file__), 'ufc_fighters.json')
+        self.normalize = normalize or names.normalize
+        self.lock = threading.Lock()
+        self.fighters = {}
+        self.index = DirectoryIndex([], self.normalize)
+        # True once the whole A-Z listing is in the index (a saved file always is)
+        self.complete = False
+        self.crawled = set()
+        self.load()
+
+    def load(self):
+        """Load the saved directory file, if there is one"""
+        if not os.path.exists(self.path):
+            print("Fighter directory not built yet; /api/search will query ufcstats.com")
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            rows = json.load(f)
+        self.fighters = {
+            fighter_id: {'first': first, 'last': last, 'nickname': nickname, 'record': record}
+            for first, last, nickname, fighter_id, record in rows
+        }
+        self.rebuild()
+        self.complete = True
+        print(f"Loaded {len(self.fighters)} fighters into the directory")
+
+    def save(self):
+        """Write the directory as compact rows, replacing the file atomically"""
+        with self.lock:
+            rows = [[f['first'], f['last'], f['nickname'], fighter_id, f['record']]
+                    for fighter_id, f in sorted(self.fighters.items())]
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def rebuild(self):
+        """Build a new index and swap it in, so searches never see a partial one"""
+        with self.lock:
+            fighters = [
+                {
+                    'name': f"{f['first']} {f['last']}".strip(),
+                    'url': FIGHTER_URL + fighter_id,
+                    'record': f['record'],
+                    'last': f['last'],
+                    'nickname': f['nickname'],
+                }
+                for fighter_id, f in self.fighters.items()
+            ]
+        self.index = DirectoryIndex(fighters, self.normalize)
+
+    def __len__(self):
+        return len(self.index.fighters)
+
+    def search(self, query, limit=20):
+        """Search by (accent-insensitive) name prefix, falling back to fuzzy matching.
+        Returns dicts shaped like UFCFighterSearch.search_fighter results.
+        """
+        return self.lookup(query, limit)[0]
+
+    def lookup(self, query, limit=20):
+        """Like search, but returns (results, complete). complete is True when
+        the results are every prefix match, so results for a longer query can
+        be picked out of them (see static/script.js); each result then also
+        has the last name and nickname that matching needs.
+        """
+        index = self.index
+        query = self.normalize(query)
+        tokens = query.split()
+        if not tokens:
+            return [], False
+
+        ids = None
+        for token in tokens:
+            matched = index.prefix_ids(token)
+            ids = matched if ids is None else ids & matched
+            if not ids:
+                break
+
+        if not ids:
+            ranked = index.fuzzy_ids(query)
+            return [
+                {key: index.fighters[idx][key] for key in ('name', 'url', 'record')}
+                for idx in ranked[:limit]
+            ], False
+
+        ranked = index.rank(ids, query, tokens)
+        return [
+            {key: index.fighters[idx][key] for key in ('name', 'url', 'record', 'last', 'nickname')}
+            for idx in ranked[:limit]
+        ], len(ranked) <= limit
+
+    def update(self, fighters):
+        """Merge crawled listing rows (dicts with first/last/nickname/url/record)"""
+        with self.lock:
+            for fighter in fighters:
+                fighter_id = fighter['url'].rstrip('/').rsplit('/', 1)[-1]
+                self.fighters[fighter_id] = {
+                    'first': fighter['first'],
+                    'last': fighter['last'],
+                    'nickname': fighter['nickname'],
+                    'record': fighter['record'],
+                }
+
+    def refresh(self, list_fighters, letters=string.ascii_lowercase, pause=0):
+        """Crawl the listing one letter at a time. A complete directory is
+        updated and saved after each letter; a new one only when the last
+        missing letter is in, so searches never see a partial list.
+        """
+        for letter in letters:
+            fighters = list_fighters(letter)
+            if fighters:
+                self.update(fighters)
+                self.crawled.add(letter)
+                if not self.complete and self.crawled >= set(string.ascii_lowercase):
+                    self.complete = True
+                if self.complete:
+                    self.rebuild()
+                    self.save()
+            print(f"Fighter directory: '{letter}' -> {len(fighters)} fighters ({len(self.fighters)} total)")
+            time.sleep(pause)
+
+    def start_background_refresh(self, list_fighters, interval=15 * 60):
+        """Re-crawl one letter every interval seconds in a daemon thread.
+        A directory that was never built fills in over the first pass and
+        is only used once it is complete.
+        """
+        def run():
+            while True:
+                for letter in string.ascii_lowercase:
+                    time.sleep(interval)
+                    try:
+                        self.refresh(list_fighters, letters=letter)
+                    except Exception as e:
+                        print(f"Error refreshing fighter directory: {e}")
+
+        thread = threading.Thread(target=run, name='fighter-directory-refresh', daemon=True)
+        thread.start()
+        return thread
+
+
+if __name__ == '__main__':
+    from app import UFCFighterSearch
+
+    directory = FighterDirectory()
+    directory.refresh(UFCFighterSearch().list_fighters, pause=1)
+    if directory.complete:
+        print(f"Saved {len(directory)} fighters to {directory.path}")
+    else:
+        missing = ''.join(sorted(set(string.ascii_lowercase) - directory.crawled))
+        print(f"Not saved: no fighters listed for '{missing}'; run it again")
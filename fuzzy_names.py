@@ -0,0 +1,116 @@
+"""
+String similarity for fighter names that are spelled differently in
+different places: transliterations ("Nurmagomedov" / "Nurmagomedow"),
+missing middle names, typos. All functions take names that have already
+been normalized (lowercase ASCII letters, digits and spaces).
+"""
+
+
+def trigrams(name):
+    """Set of 3-character substrings of a name"""
+    return {name[i:i + 3] for i in range(len(name) - 2)}
+
+
+def dice(a_grams, b_grams):
+    """Dice coefficient of two trigram sets: a cheap first look before jaro_winkler"""
+    if not a_grams or not b_grams:
+        return 0.0
+    return 2 * len(a_grams & b_grams) / (len(a_grams) + len(b_grams))
+
+
+def jaro_winkler(a, b, prefix_scale=0.1):
+    """Jaro-Winkler similarity between 0 (nothing alike) and 1 (equal)"""
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+
+    window = max(len(a), len(b)) // 2 - 1
+    b_used = [False] * len(b)
+    a_matches = []
+    for i, ch in enumerate(a):
+        # First unused equal character of b within the match window
+        end = min(len(b), i + window + 1)
+        j = b.find(ch, max(0, i - window), end)
+        while j != -1 and b_used[j]:
+            j = b.find(ch, j + 1, end)
+        if j != -1:
+            b_used[j] = True
+            a_matches.append(ch)
+    if not a_matches:
+        return 0.0
+
+    b_matches = [ch for ch, used in zip(b, b_used) if used]
+    transpositions = sum(x != y for x, y in zip(a_matches, b_matches)) // 2
+    m = len(a_matches)
+    jaro = (m / len(a) + m / len(b) + (m - transpositions) / m) / 3
+
+    prefix = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefix += 1
+    return jaro + prefix * prefix_scale * (1 - jaro)
+
+
+def levenshtein_within(a, b, limit):
+    """Edit distance between a and b, or None if it is more than limit.
+    Only a band of width 2 * limit + 1 around the diagonal is computed.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+    if len(a) > len(b):
+        a, b = b, a
+
+    big = limit + 1
+    previous = [j if j <= limit else big for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        ch = a[i - 1]
+        current = [big] * (len(b) + 1)
+        left = current[0] = i if i <= limit else big
+        row_min = left
+        for j in range(max(1, i - limit), min(len(b), i + limit) + 1):
+            cost = previous[j - 1] + (ch != b[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if left + 1 < cost:
+                cost = left + 1
+            if cost > big:
+                cost = big
+            current[j] = left = cost
+            if cost < row_min:
+                row_min = cost
+        if row_min > limit:
+            return None
+        previous = current
+    return previous[len(b)] if previous[len(b)] <= limit else None
+
+
+def name_similarity(a, b, minimum=0.0):
+    """How alike two fighter names are, from 0 to 1.
+    Tolerates a missing or extra middle name, and a bare last name against
+    a full one. Pairs more than about one edit per four letters apart, or
+    scoring below minimum, score 0.
+    """
+    a_tokens = a.split()
+    b_tokens = b.split()
+    if not a_tokens or not b_tokens:
+        return 0.0
+
+    pairs = [(a, b, 1.0)]
+    if len(a_tokens) > 1 and len(b_tokens) > 1 and max(len(a_tokens), len(b_tokens)) > 2:
+        # Compare first and last names only, ignoring middle names
+        pairs.append((f"{a_tokens[0]} {a_tokens[-1]}", f"{b_tokens[0]} {b_tokens[-1]}", 0.97))
+    if (len(a_tokens) == 1) != (len(b_tokens) == 1):
+        # A bare last name (short titles) against a full name
+        pairs.append((a_tokens[-1], b_tokens[-1], 0.95))
+
+    best = 0.0
+    for x, y, weight in pairs:
+        score = weight * jaro_winkler(x, y)
+        # The edit distance check is the expensive part, so only run it when it matters
+        if score < max(best, minimum) or score == best:
+            continue
+        if levenshtein_within(x, y, max(1, len(y) // 4)) is not None:
+            best = score
+    return best
@@ -0,0 +1,194 @@
+"""
+Streaming extractor for ufcstats.com table rows.
+An event-based html.parser subclass that only keeps the <td> cells of
+<tr> rows with a given class, and inside them only the <a> and <p>
+elements we read. Nothing else on the page is turned into objects, so it
+is much cheaper than building a BeautifulSoup tree.
+"""
+import codecs
+from html.parser import HTMLParser
+
+
+class Element:
+    """An <a>, <p> or <td> seen inside a wanted row"""
+    __slots__ = ('tag', 'classes', 'href', 'parts')
+
+    def __init__(self, tag, classes=(), href=None):
+        self.tag = tag
+        self.classes = classes
+        self.href = href
+        self.parts = []
+
+    @property
+    def text(self):
+        return ''.join(self.parts)
+
+
+class Cell(Element):
+    """A <td> with the links and paragraphs found inside it"""
+    __slots__ = ('links', 'paragraphs')
+
+    def __init__(self):
+        super().__init__('td')
+        self.links = []
+        self.paragraphs = []
+
+
+class RowExtractor(HTMLParser):
+    """Collect the cells of every <tr> carrying row_class"""
+
+    def __init__(self, row_class):
+        super().__init__(convert_charrefs=True)
+        self.row_class = row_class
+        self.rows = []      # finished rows, each a list of Cell
+        self.row = None
+        self.open = []      # elements currently collecting text
+
+    def finish_row(self):
+        """Emit the row being collected, if any"""
+        if self.row is not None:
+            self.rows.append(self.row)
+            self.row = None
+            self.open = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'tr':
+            # A <tr> implicitly closes an unclosed one, as html.parser and
+            # BeautifulSoup see it, so keep the pending row instead of losing it
+            self.finish_row()
+            classes = (dict(attrs).get('class') or '').split()
+            if self.row_class in classes:
+                self.row = []
+                self.open = []
+            return
+        if self.row is None:
+            return
+        if tag == 'td':
+            cell = Cell()
+            self.row.append(cell)
+            self.open = [cell]
+        elif tag in ('a', 'p') and self.open:
+            attrs = dict(attrs)
+            element = Element(tag, (attrs.get('class') or '').split(), attrs.get('href'))
+            cell = self.open[0]
+            (cell.links if tag == 'a' else cell.paragraphs).append(element)
+            self.open.append(element)
+
+    def handle_endtag(self, tag):
+        if self.row is None:
+            return
+        if tag in ('tr', 'tbody', 'thead', 'table'):
+            self.finish_row()
+        elif tag == 'td':
+            self.open = []
+        elif tag in ('a', 'p'):
+            # Close the innermost open element with this tag
+            for i in range(len(self.open) - 1, 0, -1):
+                if self.open[i].tag == tag:
+                    del self.open[i:]
+                    break
+
+    def handle_data(self, data):
+        for element in self.open:
+            element.parts.append(data)
+
+    def close(self):
+        super().close()
+        self.finish_row()
+
+
+def extract_rows(content, row_class):
+    """Return the cells of every row with row_class in an HTML page"""
+    if isinstance(content, bytes):
+        content = content.decode('utf-8', errors='replace')
+    extractor = RowExtractor(row_class)
+    extractor.feed(content)
+    extractor.close()
+    return extractor.rows
+
+
+def iter_rows(chunks, row_class):
+    """Yield the cells of each row with row_class as soon as its </tr> arrives.
+    chunks is an iterable of bytes (e.g. a streamed HTTP body); only the
+    rows not yet yielded are held in memory.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    extractor = RowExtractor(row_class)
+    for chunk in chunks:
+        extractor.feed(decoder.decode(chunk))
+        yield from extractor.rows
+        extractor.rows = []
+    extractor.feed(decoder.decode(b'', final=True))
+    extractor.close()
+    yield from extractor.rows
+
+
+def first_with_class(elements, cls):
+    """First element carrying cls, like soup.find(..., class_=cls)"""
+    for element in elements:
+        if cls in element.classes:
+            return element
+    return None
+
+
+def fighters_from_rows(rows):
+    """Same output as UFCFighterSearch.parse_fighter_list, from extracted rows"""
+    fighters = []
+    for cols in rows[1:]:  # Skip header row
+        if len(cols) < 10:
+            continue
+        first_name_link = first_with_class(cols[0].links, 'b-link')
+        last_name_link = first_with_class(cols[1].links, 'b-link')
+        if not (first_name_link and last_name_link):
+            continue
+
+        first_name = first_name_link.text.strip()
+        last_name = last_name_link.text.strip()
+        fighters.append({
+            'name': f"{first_name} {last_name}",
+            'url': first_name_link.href,
+            'record': f"{cols[7].text.strip()}-{cols[8].text.strip()}-{cols[9].text.strip()}",
+            'first': first_name,
+            'last': last_name,
+            'nickname': cols[2].text.strip()
+        })
+    return fighters
+
+
+def fight_from_row(cols):
+    """Same dict as UFCFighterSearch.parse_fighter_fights builds for one row, or None"""
+    if len(cols) < 7:
+        return None
+    event_link = first_with_class(cols[6].links, 'b-link')
+    if not event_link:
+        return None
+
+    date_elems = [p for p in cols[6].paragraphs if 'b-fight-details__table-text' in p.classes]
+    fighter_links = [a for a in cols[1].links if 'b-link' in a.classes]
+    return {
+        'event': event_link.text.strip(),
+        'date': date_elems[1].text.strip() if len(date_elems) > 1 else "Date Unknown",
+        'opponent': fighter_links[1].text.strip() if len(fighter_links) >= 2 else "Unknown",
+        'opponent_url': (fighter_links[1].href or '') if len(fighter_links) >= 2 else '',
+        'event_url': event_link.href or ''
+    }
+
+
+def fights_from_rows(rows):
+    """Same output as UFCFighterSearch.parse_fighter_fights, from extracted rows"""
+    fights = []
+    for cols in rows[1:]:  # Skip header
+        fight = fight_from_row(cols)
+        if fight:
+            fights.append(fight)
+    return fights
+
+
+def iter_fights(chunks):
+    """Yield the fights of a fighter page one by one while it is still arriving"""
+    rows = iter_rows(chunks, 'b-fight-details__table-row')
+    next(rows, None)  # Skip header
+    for cols in rows:
+        fight = fight_from_row(cols)
+        if fight:
+            yield fight
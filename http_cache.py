@@ -0,0 +1,125 @@
+"""
+Response cache for ufcstats.com pages.
+Keeps recent responses in an in-process LRU and, optionally, in a SQLite
+file so they survive restarts. Expired entries are kept around so they can
+be revalidated with ETag / Last-Modified instead of downloaded again, but
+the file is pruned every so often: rows expired for more than max_stale
+seconds are deleted, and then the ones closest to expiry until at most
+max_rows are left.
+"""
+from collections import OrderedDict
+import sqlite3
+import threading
+import time
+
+
+class ResponseCache:
+    """LRU cache of raw response bodies with per-entry expiry"""
+
+    PRUNE_EVERY = 100
+
+    def __init__(self, max_entries=512, db_path=None, max_rows=20000, max_stale=30 * 24 * 60 * 60):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.max_stale = max_stale
+        self.puts_since_prune = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stores': 0, 'pruned': 0}
+        self.db = None
+        if db_path:
+            self.db = sqlite3.connect(db_path, check_same_thread=False)
+            self.db.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, body BLOB, etag TEXT, '
+                'last_modified TEXT, expires REAL)'
+            )
+            self.db.execute('CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires)')
+            self.db.commit()
+            self.prune()
+
+    @staticmethod
+    def make_key(url, params=None):
+        """Build a cache key from a URL and its query parameters"""
+        if not params:
+            return url
+        query = '&'.join(f"{k}={v}" for k, v in sorted(params.items()))
+        return f"{url}?{query}"
+
+    def get(self, key):
+        """Return the cached entry for key (fresh or stale) or None"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                return entry
+            if self.db is None:
+                return None
+            row = self.db.execute(
+                'SELECT body, etag, last_modified, expires FROM responses WHERE key = ?',
+                (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        entry = {'body': row[0], 'etag': row[1], 'last_modified': row[2], 'expires': row[3]}
+        self.remember(key, entry)
+        return entry
+
+    def put(self, key, body, ttl, etag=None, last_modified=None):
+        """Store a response body for ttl seconds"""
+        entry = {
+            'body': body,
+            'etag': etag,
+            'last_modified': last_modified,
+            'expires': time.time() + ttl,
+        }
+        self.remember(key, entry)
+        prune = False
+        with self.lock:
+            self.stats['stores'] += 1
+            if self.db is not None:
+                self.db.execute(
+                    'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)',
+                    (key, body, etag, last_modified, entry['expires'])
+                )
+                self.db.commit()
+                self.puts_since_prune += 1
+                prune = self.puts_since_prune >= self.PRUNE_EVERY
+        if prune:
+            self.prune()
+        return entry
+
+    def prune(self):
+        """Delete long-expired rows from the SQLite file, then the oldest beyond max_rows"""
+        if self.db is None:
+            return 0
+        with self.lock:
+            self.puts_since_prune = 0
+            deleted = self.db.execute(
+                'DELETE FROM responses WHERE expires < ?', (time.time() - self.max_stale,)
+            ).rowcount
+            deleted += self.db.execute(
+                'DELETE FROM responses WHERE key IN ('
+                'SELECT key FROM responses ORDER BY expires DESC LIMIT -1 OFFSET ?)',
+                (self.max_rows,)
+            ).rowcount
+            self.db.commit()
+            self.stats['pruned'] += deleted
+        return deleted
+
+    def refresh(self, key, entry, ttl):
+        """Extend a revalidated entry by another ttl seconds"""
+        return self.put(key, entry['body'], ttl, entry['etag'], entry['last_modified'])
+
+    def remember(self, key, entry):
+        """Put an entry in the in-memory LRU, evicting the oldest if full"""
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def count(self, stat):
+        """Increment one of the hit/miss counters"""
+        with self.lock:
+            self.stats[stat] += 1
@@ -0,0 +1,119 @@
+"""
+Caching headers and compression for the JSON API responses.
+Every cacheable GET endpoint gets a strong ETag (a hash of the body plus
+the Paramount+ database version), a Cache-Control policy of its own, and
+gzip or brotli compression when the body is big enough to be worth it.
+A request whose If-None-Match already names the current ETag gets an
+empty 304 instead. Only 200s carry upstream data; anything else is sent
+no-store.
+
+Used by app.py (after_request) and asgi.py (the native /api/fights).
+"""
+import gzip
+import hashlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Seconds a browser/CDN may reuse a response, then serve it stale while revalidating
+CACHE_POLICIES = {
+    '/api/search': (300, 3600),
+    '/api/fights': (600, 24 * 3600),
+    '/api/paramount-link': (3600, 24 * 3600),
+    '/api/watchable': (3600, 24 * 3600),
+}
+
+# Errors (e.g. ufcstats.com failing) must not be kept by any cache
+NO_STORE = {'Cache-Control': 'no-store'}
+
+# Smaller bodies go out uncompressed
+COMPRESS_MIN_BYTES = 1024
+
+
+def cache_control(path):
+    """Cache-Control value for an endpoint, or None if it isn't cached"""
+    policy = CACHE_POLICIES.get(path)
+    if not policy:
+        return None
+    max_age, stale = policy
+    return f"public, max-age={max_age}, stale-while-revalidate={stale}"
+
+
+def choose_encoding(accept_encoding, size):
+    """Content-Encoding to use for a body of size bytes, or None"""
+    if size < COMPRESS_MIN_BYTES:
+        return None
+    offered = {token.split(';')[0].strip().lower() for token in accept_encoding.split(',')}
+    if brotli and 'br' in offered:
+        return 'br'
+    if 'gzip' in offered:
+        return 'gzip'
+    return None
+
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+def make_etag(body, version, encoding):
+    """Strong ETag for one representation: body + database version + encoding"""
+    digest = hashlib.sha256(f"{version}\n".encode() + body).hexdigest()[:32]
+    return f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == '*' or etag in (tag.strip() for tag in if_none_match.split(','))
+
+
+def prepare(path, body, version, if_none_match='', accept_encoding=''):
+    """Apply caching and compression to a 200 JSON response.
+    Returns (status, extra headers as a dict, body to send). Endpoints
+    without a cache policy come back unchanged.
+    """
+    control = cache_control(path)
+    if control is None:
+        return 200, {}, body
+
+    encoding = choose_encoding(accept_encoding, len(body))
+    etag = make_etag(body, version, encoding)
+    headers = {'Cache-Control': control, 'ETag': etag, 'Vary': 'Accept-Encoding'}
+    if etag_matches(if_none_match, etag):
+        return 304, headers, b''
+
+    if encoding:
+        body = compress(body, encoding)
+        headers['Content-Encoding'] = encoding
+    return 200, headers, body
+
+
+def init_app(app, version):
+    """Install on a Flask app. version() returns the current database version"""
+    from flask import request
+
+    @app.after_request
+    def cache_and_compress(response):
+        if request.method == 'GET' and response.status_code != 200 and cache_control(request.path):
+            response.headers.update(NO_STORE)
+            return response
+        # Streamed responses (e.g. /api/fights/stream) pass through; get_data would buffer them
+        if (request.method != 'GET' or response.status_code != 200 or response.is_streamed
+                or response.mimetype != 'application/json' or response.direct_passthrough):
+            return response
+
+        status, headers, body = prepare(request.path, response.get_data(), version(),
+                                        request.headers.get('If-None-Match', ''),
+                                        request.headers.get('Accept-Encoding', ''))
+        response.status_code = status
+        response.headers.update(headers)
+        response.set_data(body)
+        if status == 304:
+            # set_data fills in a Content-Length of 0, which a 304 must not claim
+            response.headers.pop('Content-Type', None)
+            response.headers.pop('Content-Length', None)
+        return response
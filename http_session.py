@@ -0,0 +1,231 @@
+"""
+Shared HTTP session for upstream requests to ufcstats.com.
+One keep-alive requests.Session with a sized connection pool, retries with
+backoff on 5xx responses and timeouts, a cap on concurrent requests per
+host (shared with the asyncio path), and simple latency / pool usage
+counters.
+"""
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from urllib.parse import urlsplit
+import asyncio
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class UpstreamError(Exception):
+    """ufcstats.com could not be reached or answered with an error.
+    Callers report it as such instead of as an empty result, so it is not
+    cached downstream.
+    """
+
+
+class HostLimit:
+    """Semaphore for one host that both threads and coroutines can wait on.
+    A released slot is handed straight to the longest waiting caller.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.lock = threading.Lock()
+        self.active = 0
+        self.waiters = deque()   # threading.Event, or (event loop, future)
+
+    def acquire(self):
+        with self.lock:
+            if self.active < self.limit and not self.waiters:
+                self.active += 1
+                return
+            event = threading.Event()
+            self.waiters.append(event)
+        event.wait()
+
+    async def acquire_async(self):
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            if self.active < self.limit and not self.waiters:
+                self.active += 1
+                return
+            future = loop.create_future()
+            waiter = (loop, future)
+            self.waiters.append(waiter)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self.lock:
+                queued = waiter in self.waiters
+                if queued:
+                    self.waiters.remove(waiter)
+            # Cancelled after being handed the slot: pass it on. (If the hand-off
+            # is still on its way, wake() sees the cancelled future and does that.)
+            if not queued and future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        with self.lock:
+            if not self.waiters:
+                self.active -= 1
+                return
+            waiter = self.waiters.popleft()
+        if isinstance(waiter, threading.Event):
+            waiter.set()
+        else:
+            loop, future = waiter
+            loop.call_soon_threadsafe(self.wake, future)
+
+    def busy(self):
+        """Slots in use plus callers waiting for one"""
+        with self.lock:
+            return self.active + len(self.waiters)
+
+    def wake(self, future):
+        if future.cancelled():
+            self.release()
+        else:
+            future.set_result(None)
+
+
+class UpstreamSession:
+    """Thread-safe pooled session shared by all Flask worker threads"""
+
+    def __init__(self, pool_size=20, per_host_limit=8, retries=3, backoff=0.5, headers=None):
+        self.pool_size = pool_size
+        self.per_host_limit = per_host_limit
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False,
+        )
+        # pool_block keeps us at pool_size connections instead of opening
+        # throwaway ones when every pooled connection is busy
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size,
+                              pool_block=True, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+        self.lock = threading.Lock()
+        self.host_limits = {}
+        self.host_in_flight = {}
+        self.stats = {
+            'requests': 0,
+            'errors': 0,
+            'in_flight': 0,
+            'peak_in_flight': 0,
+            'latency_total': 0.0,
+            'latency_max': 0.0,
+        }
+
+    def host_limit(self, url):
+        host = urlsplit(url).netloc
+        with self.lock:
+            limit = self.host_limits.get(host)
+            if limit is None:
+                limit = self.host_limits[host] = HostLimit(self.per_host_limit)
+        return host, limit
+
+    def started(self, host):
+        with self.lock:
+            self.stats['in_flight'] += 1
+            self.host_in_flight[host] = self.host_in_flight.get(host, 0) + 1
+            self.stats['peak_in_flight'] = max(self.stats['peak_in_flight'], self.stats['in_flight'])
+        return time.perf_counter()
+
+    def finished(self, host, start, failed):
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.stats['in_flight'] -= 1
+            self.host_in_flight[host] -= 1
+            self.stats['requests'] += 1
+            self.stats['errors'] += failed
+            self.stats['latency_total'] += elapsed
+            self.stats['latency_max'] = max(self.stats['latency_max'], elapsed)
+
+    @contextmanager
+    def slot(self, url):
+        """Hold one of url's host's request slots, and count the request, for the block"""
+        host, limit = self.host_limit(url)
+        limit.acquire()
+        try:
+            start = self.started(host)
+            failed = False
+            try:
+                yield
+            except requests.RequestException:
+                failed = True
+                raise
+            finally:
+                self.finished(host, start, failed)
+        finally:
+            limit.release()
+
+    @asynccontextmanager
+    async def async_slot(self, url):
+        """slot() for coroutines: the same per-host budget and counters, so
+        requests made with an async client (see async_search.py) and with
+        this session never add up to more than per_host_limit
+        """
+        host, limit = self.host_limit(url)
+        await limit.acquire_async()
+        try:
+            start = self.started(host)
+            failed = False
+            try:
+                yield
+            except Exception:
+                failed = True
+                raise
+            finally:
+                self.finished(host, start, failed)
+        finally:
+            limit.release()
+
+    def get(self, url, **kwargs):
+        """GET url through the shared pool, waiting if the host is at its limit"""
+        with self.slot(url):
+            return self.session.get(url, **kwargs)
+
+    @contextmanager
+    def stream(self, url, **kwargs):
+        """Like get(url, stream=True), but the host slot is held, and the
+        response open, until the block exits, so reading the body counts
+        against the limit too
+        """
+        with self.slot(url):
+            with self.session.get(url, stream=True, **kwargs) as response:
+                yield response
+
+    def busy(self):
+        """Requests holding or waiting for a host slot, from threads and
+        coroutines alike. Unlike stats['in_flight'] this includes queued ones.
+        """
+        with self.lock:
+            limits = list(self.host_limits.values())
+        return sum(limit.busy() for limit in limits)
+
+    def metrics(self):
+        """Return a snapshot of the counters plus derived pool usage.
+        Requests to one host never use more than per_host_limit of the pool,
+        so host_utilization (in flight / per_host_limit, per host) is the one
+        that reaches 1.0 when requests start queueing.
+        """
+        with self.lock:
+            stats = dict(self.stats)
+            host_in_flight = dict(self.host_in_flight)
+        stats['pool_size'] = self.pool_size
+        stats['per_host_limit'] = self.per_host_limit
+        stats['pool_utilization'] = stats['in_flight'] / self.pool_size
+        stats['host_utilization'] = {host: count / self.per_host_limit
+                                     for host, count in host_in_flight.items()}
+        stats['latency_avg'] = stats['latency_total'] / stats['requests'] if stats['requests'] else 0.0
+        return stats
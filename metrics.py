@@ -0,0 +1,245 @@
+"""
+Request instrumentation for UFC Fight Finder.
+Counters and histograms cheap enough for the hot path, a stage() timer
+that splits each request into upstream fetch, HTML parse, row extraction,
+Paramount+ matching and JSON serialization, and a Prometheus text
+rendering of all of it for /metrics.
+
+Slow requests (UFC_SLOW_REQUEST_MS, default 1000) are logged with their
+stage breakdown. Setting UFC_PROFILE_SLOW_MS turns on a sampling profiler
+that writes folded stacks (flamegraph.pl / speedscope input) for every
+request slower than that to UFC_PROFILE_DIR (default: profiles/).
+"""
+from bisect import bisect_left
+from contextlib import contextmanager
+import contextvars
+import os
+import sys
+import threading
+import time
+
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REGISTRY = []
+
+
+def format_labels(label_name, label_value, extra=''):
+    parts = [f'{label_name}="{label_value}"'] if label_name and label_value is not None else []
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class Counter:
+    """Monotonic count, optionally split by one label"""
+
+    def __init__(self, name, help, label=None):
+        self.name = name
+        self.help = help
+        self.label = label
+        self.lock = threading.Lock()
+        self.values = {} if label else {None: 0}
+        REGISTRY.append(self)
+
+    def inc(self, amount=1, label_value=None):
+        with self.lock:
+            self.values[label_value] = self.values.get(label_value, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            values = sorted(self.values.items(), key=lambda item: str(item[0]))
+        for label_value, value in values:
+            lines.append(f"{self.name}{format_labels(self.label, label_value)} {value}")
+        return lines
+
+
+class Histogram:
+    """Distribution of durations in fixed buckets, optionally split by one label"""
+
+    def __init__(self, name, help, label=None, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label = label
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.series = {}   # label value -> [bucket counts..., sum, count]
+        REGISTRY.append(self)
+
+    def observe(self, value, label_value=None):
+        slot = bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(label_value)
+            if series is None:
+                series = self.series[label_value] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[slot] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            series = sorted((key, list(values)) for key, values in self.series.items())
+        for label_value, values in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), values):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float('inf') else f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{format_labels(self.label, label_value, le)} {cumulative}")
+            labels = format_labels(self.label, label_value)
+            lines.append(f"{self.name}_sum{labels} {values[-2]}")
+            lines.append(f"{self.name}_count{labels} {values[-1]}")
+        return lines
+
+
+class Collected:
+    """Values read from elsewhere (e.g. cache stats) when /metrics is scraped.
+    collect() returns a number or a {label value: number} dict.
+    """
+
+    def __init__(self, name, help, collect, kind='gauge', label=None):
+        self.name = name
+        self.help = help
+        self.collect = collect
+        self.kind = kind
+        self.label = label
+        REGISTRY.append(self)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        values = self.collect()
+        if not isinstance(values, dict):
+            values = {None: values}
+        for label_value, value in sorted(values.items(), key=lambda item: str(item[0])):
+            lines.append(f"{self.name}{format_labels(self.label, label_value)} {value}")
+        return lines
+
+
+def render():
+    """All registered metrics in the Prometheus text exposition format"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+REQUEST_SECONDS = Histogram('ufc_request_seconds', 'Request latency by endpoint', label='endpoint')
+STAGE_SECONDS = Histogram('ufc_stage_seconds', 'Time spent in each request stage', label='stage')
+FIND_MATCH_SECONDS = Histogram('ufc_find_match_call_seconds', 'Latency of a single Paramount+ fight lookup')
+MATCHER_CANDIDATES = Counter('ufc_matcher_candidates_scanned_total', 'Database entries scored by the Paramount+ matcher')
+ERRORS = Counter('ufc_errors_total', 'Errors caught while serving requests', label='where')
+SLOW_REQUESTS = Counter('ufc_slow_requests_total', 'Requests slower than UFC_SLOW_REQUEST_MS', label='endpoint')
+
+SLOW_REQUEST_SECONDS = float(os.environ.get('UFC_SLOW_REQUEST_MS', 1000)) / 1000
+
+# Per-request stage totals, for the slow request log
+current_stages = contextvars.ContextVar('ufc_request_stages', default=None)
+
+
+@contextmanager
+def stage(name):
+    """Time a block as one stage of the current request"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, name)
+        stages = current_stages.get()
+        if stages is not None:
+            stages[name] = stages.get(name, 0) + elapsed
+
+
+class SamplingProfiler:
+    """Samples the stacks of threads that are serving requests.
+    Samples are only kept per request and written out as folded stacks
+    when the request turns out to be slow.
+    """
+
+    def __init__(self, threshold, out_dir, interval=0.005):
+        self.threshold = threshold
+        self.out_dir = out_dir
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.watched = {}   # thread id -> {folded stack: samples}
+        thread = threading.Thread(target=self.run, name='sampling-profiler', daemon=True)
+        thread.start()
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            with self.lock:
+                if not self.watched:
+                    continue
+                frames = sys._current_frames()
+                for thread_id, samples in self.watched.items():
+                    frame = frames.get(thread_id)
+                    if frame is None:
+                        continue
+                    stack = []
+                    while frame is not None:
+                        code = frame.f_code
+                        stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                        frame = frame.f_back
+                    folded = ';'.join(reversed(stack))
+                    samples[folded] = samples.get(folded, 0) + 1
+
+    def start(self):
+        with self.lock:
+            self.watched[threading.get_ident()] = {}
+
+    def stop(self, endpoint, elapsed):
+        with self.lock:
+            samples = self.watched.pop(threading.get_ident(), None)
+        if not samples or elapsed < self.threshold:
+            return
+        os.makedirs(self.out_dir, exist_ok=True)
+        path = os.path.join(self.out_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{endpoint}-{elapsed * 1000:.0f}ms.folded")
+        with open(path, 'w') as f:
+            for stack, count in sorted(samples.items()):
+                f.write(f"{stack} {count}\n")
+        print(f"Wrote profile of slow {endpoint} request to {path}")
+
+
+profiler = None
+if os.environ.get('UFC_PROFILE_SLOW_MS'):
+    profiler = SamplingProfiler(float(os.environ['UFC_PROFILE_SLOW_MS']) / 1000,
+                                os.environ.get('UFC_PROFILE_DIR', 'profiles'))
+
+
+def begin_request(profile=True):
+    """Start timing a request; returns a token for end_request"""
+    if profiler and profile:
+        profiler.start()
+    return time.perf_counter(), current_stages.set({}), profile
+
+
+def end_request(token, endpoint):
+    """Record a finished request, logging (and profiling) it if it was slow"""
+    start, stages_token, profile = token
+    elapsed = time.perf_counter() - start
+    stages = current_stages.get() or {}
+    current_stages.reset(stages_token)
+    REQUEST_SECONDS.observe(elapsed, endpoint)
+    if profiler and profile:
+        profiler.stop(endpoint, elapsed)
+    if elapsed >= SLOW_REQUEST_SECONDS:
+        SLOW_REQUESTS.inc(1, endpoint)
+        breakdown = ', '.join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in stages.items())
+        print(f"Slow request: {endpoint} took {elapsed * 1000:.0f}ms ({breakdown or 'no stages'})")
+
+
+def init_app(app):
+    """Time every request of a Flask app"""
+    from flask import g, request
+
+    @app.before_request
+    def start_timer():
+        g.metrics_token = begin_request()
+
+    @app.teardown_request
+    def stop_timer(error=None):
+        token = g.pop('metrics_token', None)
+        if token:
+            end_request(token, request.endpoint or 'unknown')
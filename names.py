@@ -0,0 +1,40 @@
+"""
+Fighter name normalization shared by the Paramount+ matcher and the
+fighter directory: lowercase, accents folded to plain letters, anything
+other than a-z, 0-9 and spaces dropped.
+
+Accents are folded with Unicode NFKD decomposition, so every Latin
+diacritic is covered (not only a fixed list), plus a few letters NFKD
+leaves alone such as ø and ł. Results are memoized, since the same
+query and database names are normalized over and over.
+"""
+from functools import lru_cache
+import string
+import unicodedata
+
+# Letters that have no NFKD decomposition into a base letter + accent
+EXTRA_LETTERS = str.maketrans({
+    'ø': 'o', 'đ': 'd', 'ð': 'd', 'ł': 'l', 'ħ': 'h', 'ı': 'i',
+    'ß': 'ss', 'æ': 'ae', 'œ': 'oe', 'þ': 'th',
+})
+
+# Deletes every ASCII character except a-z, 0-9 and space
+KEEP = set(string.ascii_lowercase + string.digits + ' ')
+DROP_ASCII = str.maketrans('', '', ''.join(chr(c) for c in range(128) if chr(c) not in KEEP))
+
+NORMALIZE_CACHE_SIZE = 16384
+
+
+def fold_accents(name):
+    """Replace accented letters with plain ASCII ones and drop other non-ASCII characters"""
+    name = unicodedata.normalize('NFKD', name.translate(EXTRA_LETTERS))
+    return name.encode('ascii', 'ignore').decode('ascii')
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize(name):
+    """Normalize a name for matching — lowercase, strip accents/punctuation"""
+    name = name.lower().strip()
+    if not name.isascii():
+        name = fold_accents(name)
+    return name.translate(DROP_ASCII)
@@ -0,0 +1,169 @@
+"""
+Background prefetching of ufcstats.com fighter pages.
+After a fight history is served, the opponents' pages are queued, since
+the next click is usually one of them. A warm-up pass also loads the
+fighters who appear most often in the Paramount+ database, at startup
+and then every few hours.
+
+Prefetches fill the response cache, so a later /api/fights for the same
+fighter is a cache hit. Each runs as the page's single-flight call, so a
+request for it arriving mid-prefetch waits for that fetch instead of
+making its own. They run on a small worker pool, at most `rate` fetches a
+second, and wait while foreground requests (threads or coroutines) are
+talking to, or queued for, ufcstats.com. The queue is bounded; when it is
+full new work is dropped.
+"""
+from contextlib import contextmanager
+import itertools
+import queue
+import threading
+import time
+
+import names
+
+# Priorities: lower runs first
+OPPONENT = 0
+WARM_UP = 1
+
+
+class Prefetcher:
+    """Bounded, rate-limited background page fetches for a UFCFighterSearch.
+    directory (a FighterDirectory) is used to find warm-up fighters' URLs
+    when it is complete; otherwise they are searched for on ufcstats.com.
+    """
+
+    def __init__(self, search, directory=None, workers=2, rate=1.0, max_queue=200, opponents=8):
+        self.search = search
+        self.directory = directory
+        self.workers = workers
+        self.interval = 1.0 / rate
+        self.opponents = opponents
+        self.queue = queue.PriorityQueue(max_queue)
+        self.order = itertools.count()
+        self.lock = threading.Lock()
+        self.pending = set()
+        self.next_fetch = 0.0
+        self.in_flight = 0
+        self.stats = {'queued': 0, 'fetched': 0, 'fresh': 0, 'dropped': 0, 'errors': 0}
+        self.threads = []
+
+    def start(self):
+        for number in range(self.workers):
+            thread = threading.Thread(target=self.run, name=f'prefetch-{number}', daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def count(self, stat):
+        with self.lock:
+            self.stats[stat] += 1
+
+    def enqueue(self, kind, value, priority):
+        """Queue a ('page', url) or ('name', fighter name) job unless it is already queued"""
+        if not self.threads:
+            return False
+        with self.lock:
+            if (kind, value) in self.pending:
+                return False
+            self.pending.add((kind, value))
+        try:
+            self.queue.put_nowait((priority, next(self.order), kind, value))
+        except queue.Full:
+            with self.lock:
+                self.pending.discard((kind, value))
+            self.count('dropped')
+            return False
+        self.count('queued')
+        return True
+
+    def prefetch_opponents(self, fights):
+        """Queue the pages of the opponents in a served fight history, most recent first"""
+        urls = [fight.get('opponent_url') for fight in fights]
+        for url in [url for url in dict.fromkeys(urls) if url][:self.opponents]:
+            self.enqueue('page', url, OPPONENT)
+
+    def warm_up(self, fighter_names):
+        """Queue the pages of these fighters, looked up by name"""
+        for name in fighter_names:
+            self.enqueue('name', name, WARM_UP)
+
+    def start_warm_up(self, popular, delay=60, interval=6 * 60 * 60):
+        """Warm up popular() fighters after delay seconds, then every interval seconds"""
+        def run():
+            time.sleep(delay)
+            while True:
+                try:
+                    self.warm_up(popular())
+                except Exception as e:
+                    print(f"Error queueing prefetch warm-up: {e}")
+                time.sleep(interval)
+
+        thread = threading.Thread(target=run, name='prefetch-warm-up', daemon=True)
+        thread.start()
+        return thread
+
+    def run(self):
+        while True:
+            _, _, kind, value = self.queue.get()
+            try:
+                if kind == 'page':
+                    self.fetch_page(value)
+                else:
+                    url = self.resolve(value)
+                    if url:
+                        self.fetch_page(url)
+            except Exception as e:
+                self.count('errors')
+                print(f"Error prefetching {value}: {e}")
+            finally:
+                with self.lock:
+                    self.pending.discard((kind, value))
+
+    @contextmanager
+    def turn(self):
+        """Wait until foreground requests are done and the rate limit allows a fetch"""
+        while True:
+            busy = self.search.session.busy()
+            with self.lock:
+                foreground = busy - self.in_flight
+                now = time.monotonic()
+                if foreground <= 0 and now >= self.next_fetch:
+                    self.next_fetch = now + self.interval
+                    self.in_flight += 1
+                    break
+                wait = max(self.next_fetch - now, 0.1)
+            time.sleep(wait)
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def fetch_page(self, url):
+        """Load a fighter page into the response cache, unless it is fresh already"""
+        search = self.search
+        key = search.cache.make_key(url)
+        entry = search.cache.get(key)
+        if (entry and entry['expires'] > time.time()) or ('fights', url) in search.flights.calls:
+            self.count('fresh')
+            return
+
+        with self.turn():
+            # Loaded (and parsed) as the page's single-flight call, so a
+            # foreground request for it joins this fetch. If one is already
+            # loading the page, leave it to that.
+            loaded = search.flights.do_if_idle(('fights', url),
+                                               lambda: search.load_fighter_fights(url))
+        self.count('fetched' if loaded else 'fresh')
+
+    def resolve(self, name):
+        """ufcstats URL of a fighter, from the directory or a search by last name"""
+        wanted = names.normalize(name)
+        if self.directory is not None and self.directory.complete:
+            candidates = self.directory.search(name, limit=5)
+        else:
+            with self.turn():
+                candidates = self.search.search_fighter(name.split()[-1])
+        for fighter in candidates:
+            if names.normalize(fighter['name']) == wanted:
+                return fighter['url']
+        return None
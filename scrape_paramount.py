@@ -9,24 +9,174 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import Select, WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
+from fight_titles import parse_fight_title
+from collections import Counter
+from datetime import datetime, timedelta
+import argparse
+import multiprocessing
+import os
+import queue
 import re
 import json
 import time
 import sys
 
-def setup_driver():
+DB_PATH = 'paramount_fights.json'
+MANIFEST_PATH = 'paramount_manifest.json'
+JOURNAL_PATH = 'paramount_fights.journal.jsonl'
+
+# Shows to scrape
+SHOWS = [
+    ('https://www.paramountplus.com/shows/ufc/', 'UFC (Numbered Events)'),
+    ('https://www.paramountplus.com/shows/ufc-fight-night/', 'UFC Fight Night'),
+    ('https://www.paramountplus.com/shows/ufc-2010s/', 'UFC 2010s'),
+    ('https://www.paramountplus.com/shows/ufc-2000s/', 'UFC 2000s'),
+]
+
+def setup_driver(driver_path=None):
     options = Options()
     options.add_argument('--headless=new')
     options.add_argument('--disable-gpu')
     options.add_argument('--no-sandbox')
     options.add_argument('--window-size=1920,1080')
-    service = Service(ChromeDriverManager().install())
+    service = Service(driver_path or ChromeDriverManager().install())
     return webdriver.Chrome(service=service, options=options)
 
-def get_fights_on_page(driver):
-    """Extract all fight video links currently visible on the page"""
+# =============================================================================
+# Waiting — poll the page for the state we need instead of sleeping a fixed
+# time, with timeouts that adapt to how fast pages have been responding
+# =============================================================================
+DROPDOWN_ITEMS = 'ul.dropdown__filter__fake li, .dropdown__filter__list li'
+
+# Everything the waits look at, read in a single WebDriver round trip
+PAGE_STATE_JS = """
+    var select = document.querySelector('select.dropdown__filter__fake');
+    var links = document.querySelectorAll('a[href*="/video/"]');
+    var more = document.querySelector('button.load-more-button');
+    return {
+        ready: document.readyState === 'complete',
+        has_dropdown: !!select,
+        selected: select ? select.value : null,
+        count: links.length,
+        signature: Array.prototype.slice.call(links, 0, 5).map(function (a) { return a.href; }).join(' '),
+        more: !!(more && more.offsetParent !== null)
+    };
+"""
+
+class Pacer:
+    """Adaptive timeout for one kind of wait.
+    Keeps a moving average of how long the condition took to come true and
+    allows a few times that, within fixed bounds, before giving up.
+    """
+    def __init__(self, name, initial, minimum, maximum, factor=4.0):
+        self.name = name
+        self.minimum = minimum
+        self.maximum = maximum
+        self.factor = factor
+        self.average = initial / factor
+        self.waits = 0
+        self.timeouts = 0
+        self.total = 0.0
+    
+    def timeout(self):
+        return min(self.maximum, max(self.minimum, self.factor * self.average))
+    
+    def wait(self, driver, condition):
+        """Wait until condition(driver) is truthy. Returns its value, or False on timeout"""
+        start = time.time()
+        try:
+            result = WebDriverWait(driver, self.timeout(), poll_frequency=0.1).until(condition)
+        except TimeoutException:
+            result = False
+        elapsed = time.time() - start
+        self.average = 0.7 * self.average + 0.3 * elapsed
+        self.waits += 1
+        self.timeouts += not result
+        self.total += elapsed
+        return result
+    
+    def report(self):
+        avg = self.total / self.waits if self.waits else 0
+        return (f"{self.name}: {self.waits} waits, avg {avg:.2f}s, "
+                f"{self.timeouts} timeouts, timeout now {self.timeout():.1f}s")
+
+PACERS = {
+    'page': Pacer('page load', initial=5, minimum=3, maximum=30),
+    'dropdown': Pacer('dropdown open', initial=0.5, minimum=0.5, maximum=5),
+    'event': Pacer('event switch', initial=3, minimum=2, maximum=20),
+    'more': Pacer('show more', initial=2, minimum=1.5, maximum=15),
+}
+
+def page_state(driver):
+    return driver.execute_script(PAGE_STATE_JS)
+
+def wait_for_show_page(driver):
+    """Wait until a freshly loaded show page has its dropdown or video cards"""
+    def loaded(d):
+        state = page_state(d)
+        return state['ready'] and (state['has_dropdown'] or state['count'] > 0)
+    return PACERS['page'].wait(driver, loaded)
+
+def pacing_report():
+    return '\n'.join(f"  {pacer.report()}" for pacer in PACERS.values())
+
+# All video anchors with their parent's text, in one WebDriver round trip
+VIDEO_LINKS_JS = """
+    return Array.prototype.map.call(document.querySelectorAll('a[href*="/video/"]'), function (a) {
+        return {href: a.href, parentText: (a.parentElement || a).innerText || ''};
+    });
+"""
+
+def fight_from_link(href, text):
+    """Build a fight from a video link and its card text, or None if it isn't a fight"""
+    if not href:
+        return None
+    
+    video_match = re.search(r'/video/([A-Za-z0-9_-]+)', href)
+    if not video_match:
+        return None
+    
+    code = video_match.group(1)
+    
+    # Only include if it looks like a fight (has "vs" in the title)
+    if 'vs' in text.lower() or 'vs.' in text.lower():
+        # Find the actual fight title line (skip "SUBSCRIBE" button text)
+        title_line = ''
+        for line in text.split('\n'):
+            line = line.strip()
+            if ('vs' in line.lower() or 'vs.' in line.lower()) and line.upper() != 'SUBSCRIBE':
+                title_line = line
+                break
+        
+        if title_line:
+            return {
+                'code': code,
+                'url': href,
+                'title': title_line
+            }
+    return None
+
+def get_fights_on_page(driver, bulk=True):
+    """Extract all fight video links currently visible on the page.
+    bulk reads every link and its card text with a single execute_script;
+    otherwise each link is read element by element (several round trips each).
+    """
+    if bulk:
+        links = [(link['href'], link['parentText'].strip()) for link in driver.execute_script(VIDEO_LINKS_JS)]
+    else:
+        links = list(iter_video_links(driver))
+    
     fights = []
+    for href, text in links:
+        fight = fight_from_link(href, text)
+        if fight:
+            fights.append(fight)
+    return fights
+
+def iter_video_links(driver):
+    """(href, parent text) for each video link, one WebDriver call at a time"""
     video_elements = driver.find_elements(By.CSS_SELECTOR, 'a[href*="/video/"]')
     
     for elem in video_elements:
@@ -35,12 +185,6 @@ def get_fights_on_page(driver):
             if not href:
                 continue
             
-            video_match = re.search(r'/video/([A-Za-z0-9_-]+)', href)
-            if not video_match:
-                continue
-            
-            code = video_match.group(1)
-            
             # Get text from parent for fight title
             try:
                 parent = elem.find_element(By.XPATH, './..')
@@ -48,26 +192,9 @@ def get_fights_on_page(driver):
             except:
                 text = elem.text.strip()
             
-            # Only include if it looks like a fight (has "vs" in the title)
-            if 'vs' in text.lower() or 'vs.' in text.lower():
-                # Find the actual fight title line (skip "SUBSCRIBE" button text)
-                title_line = ''
-                for line in text.split('\n'):
-                    line = line.strip()
-                    if ('vs' in line.lower() or 'vs.' in line.lower()) and line.upper() != 'SUBSCRIBE':
-                        title_line = line
-                        break
-                
-                if title_line:
-                    fights.append({
-                        'code': code,
-                        'url': href,
-                        'title': title_line
-                    })
+            yield href, text
         except:
             continue
-    
-    return fights
 
 def click_show_more(driver, max_clicks=10):
     """Click 'Show More' button until all fights are loaded"""
@@ -75,16 +202,88 @@ def click_show_more(driver, max_clicks=10):
         try:
             show_more = driver.find_element(By.CSS_SELECTOR, 'button.load-more-button')
             if show_more.is_displayed():
+                before = page_state(driver)['count']
                 driver.execute_script("arguments[0].click();", show_more)
-                time.sleep(2)
+                # Wait for new cards, or for the button to go away when nothing is left
+                def loaded_more(d):
+                    state = page_state(d)
+                    return state['count'] > before or not state['more']
+                if not PACERS['more'].wait(driver, loaded_more):
+                    break
             else:
                 break
         except:
             break
 
-def scrape_show_page(driver, show_url, show_name):
-    """Scrape all fights from a Paramount+ show page with season dropdown"""
+def list_events(driver):
+    """Return (value, name) for every event in the show's dropdown, or None if there is none"""
+    try:
+        select_elem = driver.find_element(By.CSS_SELECTOR, 'select.dropdown__filter__fake')
+        select = Select(select_elem)
+        options = select.options
+        event_names = [(opt.get_attribute('value'), opt.text.strip()) for opt in options]
+        print(f"Found {len(event_names)} events")
+        return event_names
+    except Exception as e:
+        print(f"No dropdown found: {e}")
+        return None
+
+def select_event(driver, value, name):
+    """Switch the show page to one event from the dropdown"""
+    before = page_state(driver)
+    
+    # Use JavaScript to change the select value and trigger change event
+    # First, click the filter button to open dropdown
+    filter_btn = driver.find_element(By.CSS_SELECTOR, 'button.js-filter')
+    driver.execute_script("arguments[0].click();", filter_btn)
+    PACERS['dropdown'].wait(driver, EC.visibility_of_any_elements_located((By.CSS_SELECTOR, DROPDOWN_ITEMS)))
+    
+    # Find and click the dropdown option
+    dropdown_items = driver.find_elements(By.CSS_SELECTOR, DROPDOWN_ITEMS)
+    clicked = False
+    for item in dropdown_items:
+        if item.text.strip() == name:
+            driver.execute_script("arguments[0].click();", item)
+            clicked = True
+            break
+    
+    if not clicked:
+        # Fallback: use JavaScript to change the select
+        driver.execute_script(f"""
+            var select = document.querySelector('select.dropdown__filter__fake');
+            select.value = '{value}';
+            select.dispatchEvent(new Event('change', {{ bubbles: true }}));
+        """)
+    
+    # Done once the dropdown shows this event and its cards have replaced the
+    # previous ones (or are present, if it was already the selected event)
+    already_selected = before['selected'] == value
+    def switched(d):
+        state = page_state(d)
+        return (state['selected'] == value and state['count'] > 0
+                and (already_selected or state['signature'] != before['signature']))
+    PACERS['event'].wait(driver, switched)
+
+def scrape_event(driver, value, name):
+    """Load every fight for one event of the current show page"""
+    select_event(driver, value, name)
+    
+    # Click "Show More" to load all fights for this event
+    click_show_more(driver)
+    
+    # Get fights
+    return get_fights_on_page(driver)
+
+def scrape_show_page(driver, show_url, show_name, skip=None, on_event=None):
+    """Scrape all fights from a Paramount+ show page with season dropdown.
+    skip(show_url, name) can return True to leave an event out, and
+    on_event(show_url, show_name, position, value, name, fights, error, seconds)
+    is called after each event is scraped; position is the event's place in
+    the show's dropdown.
+    """
     all_fights = {}
+    skip = skip or (lambda url, name: False)
+    on_event = on_event or (lambda *args: None)
     
     print(f"\n{'='*60}")
     print(f"Scraping: {show_name}")
@@ -92,186 +291,486 @@ def scrape_show_page(driver, show_url, show_name):
     print(f"{'='*60}")
     
     driver.get(show_url)
-    time.sleep(5)
+    wait_for_show_page(driver)
     
     # Find the season/event dropdown
-    try:
-        select_elem = driver.find_element(By.CSS_SELECTOR, 'select.dropdown__filter__fake')
-        select = Select(select_elem)
-        options = select.options
-        event_names = [(opt.get_attribute('value'), opt.text.strip()) for opt in options]
-        print(f"Found {len(event_names)} events")
-    except Exception as e:
-        print(f"No dropdown found: {e}")
+    event_names = list_events(driver)
+    if event_names is None:
+        if skip(show_url, show_name):
+            print("Already captured, skipping")
+            return all_fights
         # Just get what's on the page
+        start = time.time()
         click_show_more(driver)
         fights = get_fights_on_page(driver)
         for f in fights:
             all_fights[f['code']] = f
         print(f"Got {len(fights)} fights from page")
+        on_event(show_url, show_name, 0, None, show_name, fights, None, time.time() - start)
         return all_fights
     
     # Iterate through each event
     for idx, (value, name) in enumerate(event_names):
+        if skip(show_url, name):
+            continue
         print(f"\n  [{idx+1}/{len(event_names)}] {name}...")
         
+        start = time.time()
         try:
-            # Use JavaScript to change the select value and trigger change event
-            # First, click the filter button to open dropdown
-            filter_btn = driver.find_element(By.CSS_SELECTOR, 'button.js-filter')
-            driver.execute_script("arguments[0].click();", filter_btn)
-            time.sleep(0.5)
-            
-            # Find and click the dropdown option
-            dropdown_items = driver.find_elements(By.CSS_SELECTOR, 'ul.dropdown__filter__fake li, .dropdown__filter__list li')
-            clicked = False
-            for item in dropdown_items:
-                if item.text.strip() == name:
-                    driver.execute_script("arguments[0].click();", item)
-                    clicked = True
-                    break
-            
-            if not clicked:
-                # Fallback: use JavaScript to change the select
-                driver.execute_script(f"""
-                    var select = document.querySelector('select.dropdown__filter__fake');
-                    select.value = '{value}';
-                    select.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                """)
-            
-            time.sleep(3)
-            
-            # Click "Show More" to load all fights for this event
-            click_show_more(driver)
-            
-            # Get fights
-            fights = get_fights_on_page(driver)
+            fights = scrape_event(driver, value, name)
             
             for f in fights:
                 if f['code'] not in all_fights:
                     all_fights[f['code']] = f
             
             print(f"    Found {len(fights)} fights (Total unique: {len(all_fights)})")
+            on_event(show_url, show_name, idx, value, name, fights, None, time.time() - start)
             
         except Exception as e:
             print(f"    Error: {e}")
+            on_event(show_url, show_name, idx, value, name, [], str(e), time.time() - start)
             continue
     
     return all_fights
 
-def parse_fight_title(title):
-    """Parse a fight title into structured data.
-    Handles multiple formats:
-    1. 'Alexander Volkanovski vs. Diego Lopes (UFC 325: ... - Main)'
-    2. '323: Blachowicz vs. Guskov Main Card'
-    3. 'UFC 307: Ketlen Vieira vs. Kayla Harrison Main Card'
-    4. 'Watch the UFC 313 showdown between Joshua Van vs. Rei Tsuruya streamed on ...'
-    5. 'Watch the Alexandre Pantoja vs. Yuta Sasaki bout from UFC Fight Night...'
-    6. 'Diego Lopes vs. Jean Silva'
-    7. 'UFC 110: Cain Velasquez vs. Antonio Rodrigo Nogueira'
+# =============================================================================
+# Parallel scraping — N drivers in separate processes share a queue of
+# (show, event) work items
+# =============================================================================
+def scrape_worker(driver_path, tasks, results):
+    """Worker process: scrape (show, event) items from tasks until it gets None"""
+    driver = setup_driver(driver_path)
+    current_show = None
+    try:
+        while True:
+            item = tasks.get()
+            if item is None:
+                break
+            index, show_url, value, name = item
+            start = time.time()
+            try:
+                # Workers keep their show page loaded between items of the same show
+                if show_url != current_show:
+                    driver.get(show_url)
+                    wait_for_show_page(driver)
+                    current_show = show_url
+                if value is None:
+                    # Show without an event dropdown: take what's on the page
+                    click_show_more(driver)
+                    fights = get_fights_on_page(driver)
+                else:
+                    fights = scrape_event(driver, value, name)
+                results.put((index, fights, None, time.time() - start))
+            except Exception as e:
+                # Reload the page for the next item in case this one left it broken
+                current_show = None
+                results.put((index, [], str(e), time.time() - start))
+                # A WebDriver error other than one of our waits timing out usually
+                # means the browser crashed or hung, so start a new one
+                if isinstance(e, WebDriverException) and not isinstance(e, TimeoutException):
+                    print(f"Restarting driver {multiprocessing.current_process().name}: {e}")
+                    quit_driver(driver)
+                    driver = None
+                    driver = setup_driver(driver_path)
+    finally:
+        print(f"Driver {multiprocessing.current_process().name} pacing:\n{pacing_report()}")
+        if driver is not None:
+            quit_driver(driver)
+
+def quit_driver(driver):
+    """Quit a driver that may already be dead"""
+    try:
+        driver.quit()
+    except Exception as e:
+        print(f"Error quitting driver: {e}")
+
+def list_work_items(driver_path, shows):
+    """List every (show, event) pair to scrape, using one driver.
+    Returns (items, complete); complete is False if a show couldn't be listed.
+    Items are (index, show_url, show_name, position in the dropdown, value, name).
     """
-    result = {
-        'fighter1': '',
-        'fighter2': '',
-        'event': '',
-        'card': '',
-        'raw': title
-    }
-    
-    # Remove "SUBSCRIBE" prefix
-    title = re.sub(r'^SUBSCRIBE\s*', '', title).strip()
-    
-    # Skip event recaps and non-fight content
-    if 'Event Recap' in title or 'Storylines' in title or 'Breakdown' in title:
-        return result
+    driver = setup_driver(driver_path)
+    items = []
+    complete = True
+    try:
+        for show_url, show_name in shows:
+            print(f"\nListing events: {show_name}")
+            try:
+                driver.get(show_url)
+                wait_for_show_page(driver)
+                event_names = list_events(driver)
+            except Exception as e:
+                print(f"  Error listing {show_name}: {e}")
+                complete = False
+                continue
+            for position, (value, name) in enumerate(event_names or [(None, show_name)]):
+                items.append((len(items), show_url, show_name, position, value, name))
+    finally:
+        driver.quit()
+    return items, complete
+
+def merge_results(items, results):
+    """Merge per-event fights by video code the same way the serial scraper does:
+    within a show the first event to list a video wins, and later shows override earlier ones.
+    items must be in show and dropdown order."""
+    all_fights = {}
+    show_fights = {}
+    current_show = None
+    for index, show_url, show_name, position, value, name in items:
+        if show_url != current_show:
+            all_fights.update(show_fights)
+            show_fights = {}
+            current_show = show_url
+        for f in results.get(index, []):
+            if f['code'] not in show_fights:
+                show_fights[f['code']] = f
+    all_fights.update(show_fights)
+    return all_fights
+
+def scrape_parallel(shows, workers, skip=None, on_event=None):
+    """Scrape all shows with a pool of driver processes. Returns ({code: fight},
+    complete), where complete is False if some events were never scraped
+    (a show that couldn't be listed, or every driver exiting early).
+    skip and on_event work as in scrape_show_page.
+    """
+    driver_path = ChromeDriverManager().install()
+    items, complete = list_work_items(driver_path, shows)
+    if skip:
+        items = [item for item in items if not skip(item[1], item[5])]
+        items = [(index,) + item[1:] for index, item in enumerate(items)]
+    if not items:
+        print("\nNothing to scrape")
+        return {}, complete
+    workers = max(1, min(workers, len(items)))
+    print(f"\nScraping {len(items)} events with {workers} drivers")
     
-    # FORMAT 1: "Fighter1 vs. Fighter2 (Event - Card)"
-    match = re.match(r'(.+?)\s+vs\.?\s+(.+?)\s*\((.+?)\)', title)
-    if match:
-        result['fighter1'] = match.group(1).strip()
-        result['fighter2'] = match.group(2).strip()
-        event_part = match.group(3).strip()
-        if ' - ' in event_part:
-            parts = event_part.rsplit(' - ', 1)
-            result['event'] = parts[0].strip()
-            result['card'] = parts[1].strip()
-        else:
-            result['event'] = event_part
-        return result
+    tasks = multiprocessing.Queue()
+    results = multiprocessing.Queue()
+    for index, show_url, show_name, position, value, name in items:
+        tasks.put((index, show_url, value, name))
+    for _ in range(workers):
+        tasks.put(None)
     
-    # FORMAT 2: "323: Fighter vs. Fighter Main Card/Prelims"
-    match = re.match(r'^(\d+):\s+(.+?)\s+vs\.?\s+(.+?)(?:\s+(Main Card|Prelims|Early Prelims))?\s*$', title)
-    if match:
-        result['event'] = f"UFC {match.group(1)}"
-        result['fighter1'] = match.group(2).strip()
-        result['fighter2'] = match.group(3).strip()
-        result['card'] = match.group(4).strip() if match.group(4) else ''
-        return result
+    processes = [multiprocessing.Process(target=scrape_worker, args=(driver_path, tasks, results))
+                 for _ in range(workers)]
+    for p in processes:
+        p.start()
     
-    # FORMAT 3: "UFC 307: Fighter vs. Fighter Main Card/Prelims"
-    match = re.match(r'^(UFC\s+\d+):\s+(.+?)\s+vs\.?\s+(.+?)(?:\s+(Main Card|Prelims|Early Prelims))?\s*$', title)
-    if match:
-        result['event'] = match.group(1).strip()
-        result['fighter1'] = match.group(2).strip()
-        result['fighter2'] = match.group(3).strip()
-        result['card'] = match.group(4).strip() if match.group(4) else ''
-        return result
+    fights_by_item = {}
+    seen = set()
+    start = time.time()
+    done = 0
+    while done < len(items):
+        try:
+            index, fights, error, seconds = results.get(timeout=30)
+        except queue.Empty:
+            if not any(p.is_alive() for p in processes):
+                print("\nAll drivers exited early; keeping what was scraped")
+                complete = False
+                break
+            continue
+        done += 1
+        fights_by_item[index] = fights
+        seen.update(f['code'] for f in fights)
+        _, show_url, show_name, position, value, name = items[index]
+        if on_event:
+            on_event(show_url, show_name, position, value, name, fights, error, seconds)
+        elapsed = time.time() - start
+        status = f"Error: {error}" if error else f"{len(fights)} fights"
+        print(f"  [{done}/{len(items)}] {show_name} / {name}: {status} "
+              f"({len(seen)} unique, {done / elapsed * 60:.1f} events/min)")
     
-    # FORMAT 4: "Watch the UFC NNN showdown between Fighter1 vs. Fighter2 streamed on..."
-    match = re.match(r'Watch the (?:UFC\s+\d+\s+showdown between\s+)?(.+?)\s+vs\.?\s+(.+?)\s+(?:bout\s+from\s+|streamed\s+on)', title)
-    if match:
-        result['fighter1'] = match.group(1).strip()
-        result['fighter2'] = match.group(2).strip()
-        # Try to get event name
-        evt = re.search(r'(UFC\s+\d+|UFC Fight Night[^:]*)', title)
-        if evt:
-            result['event'] = evt.group(1).strip()
-        return result
+    for p in processes:
+        p.join()
     
-    # FORMAT 5: "Watch the Fighter1 vs. Fighter2 bout from EVENT from DATE in LOCATION"
-    match = re.match(r'Watch the\s+(.+?)\s+vs\.?\s+(.+?)\s+bout\s+from\s+(.+?)(?:\s+from\s+|\s+streamed)', title)
-    if match:
-        result['fighter1'] = match.group(1).strip()
-        result['fighter2'] = match.group(2).strip()
-        result['event'] = match.group(3).strip()
-        return result
+    print(f"\nScraped {len(items)} events in {time.time() - start:.0f}s")
+    return merge_results(items, fights_by_item), complete
+
+# =============================================================================
+# Incremental scraping — a manifest of what each event gave us last time, so
+# later runs only visit events that are new or may still be changing
+# =============================================================================
+class Manifest:
+    """Per-event scrape record: when it was scraped, how long it took,
+    how many fights it had and their video codes.
+    Events are keyed by show URL and dropdown name.
+    """
+    def __init__(self, path=MANIFEST_PATH, settle_days=14):
+        self.path = path
+        self.settle = timedelta(days=settle_days)
+        self.skipped = 0
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.events = json.load(f)
+        except (OSError, ValueError):
+            self.events = {}
     
-    # FORMAT 6: Simple "Fighter1 vs. Fighter2"
-    match = re.match(r'^(.+?)\s+vs\.?\s+(.+?)$', title)
-    if match:
-        result['fighter1'] = match.group(1).strip()
-        result['fighter2'] = match.group(2).strip()
-        return result
+    @staticmethod
+    def key(show_url, name):
+        return f"{show_url}|{name}"
+    
+    def is_captured(self, show_url, name, known_codes):
+        """True if the event was fully scraped before and needn't be visited again.
+        Events that failed or came back empty, whose videos are no longer all in
+        the database, or that were first seen recently (new events keep getting
+        fight videos for a while) are scraped again. Events that were already
+        in the database when first recorded count as settled straight away.
+        """
+        entry = self.events.get(self.key(show_url, name))
+        if not entry or entry.get('error') or not entry.get('codes'):
+            return False
+        if not known_codes.issuperset(entry['codes']):
+            return False
+        if (not entry.get('settled')
+                and datetime.now() - datetime.fromisoformat(entry['first_seen']) < self.settle):
+            return False
+        self.skipped += 1
+        return True
+    
+    def record(self, show_url, show_name, value, name, fights, error, seconds, scraped_at=None,
+               known_codes=frozenset()):
+        """Store the outcome of scraping one event. known_codes are the video
+        codes that were in the database before this run.
+        """
+        now = scraped_at or datetime.now().isoformat(timespec='seconds')
+        entry = self.events.get(self.key(show_url, name))
+        if entry is None:
+            entry = self.events[self.key(show_url, name)] = {'first_seen': now}
+            # If every video was already in the database this isn't a new event
+            # still being filled in, just one the manifest hasn't seen before
+            codes = set(f['code'] for f in fights)
+            if not error and codes and known_codes.issuperset(codes):
+                entry['settled'] = True
+        entry.update({
+            'show': show_name,
+            'event': name,
+            'value': value,
+            'scraped_at': now,
+            'seconds': round(seconds, 1),
+            'error': error,
+        })
+        # A failed scrape keeps the counts from the last good one
+        if not error:
+            codes = sorted(set(f['code'] for f in fights))
+            entry['fights'] = len(codes)
+            entry['codes'] = codes
     
-    return result
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.events, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
 
-def main():
-    print("UFC Paramount+ Fight Scraper")
-    print("="*60)
+# =============================================================================
+# Journal — every scraped event is appended to a JSONL file as soon as it is
+# done, so a crash loses at most the event in progress and the next run
+# resumes where this one stopped
+# =============================================================================
+class Journal:
+    """Append-only record of the events scraped by the current run"""
+    def __init__(self, path=JOURNAL_PATH):
+        self.path = path
+        self.records = []
+        if os.path.exists(path):
+            self.records = self.read()
+        self.completed = set((r['show_url'], r['event']) for r in self.records if not r['error'])
+        # Failed attempts per event, across the runs this journal has seen
+        self.failures = Counter((r['show_url'], r['event']) for r in self.records if r['error'])
+        self.file = open(path, 'a', encoding='utf-8')
+    
+    def read(self):
+        """Load records from an interrupted run, dropping a half-written last line"""
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        complete = data[:data.rfind(b'\n') + 1]
+        if len(complete) != len(data):
+            with open(self.path, 'r+b') as f:
+                f.truncate(len(complete))
+        return [json.loads(line) for line in complete.decode('utf-8').splitlines() if line.strip()]
+    
+    def done(self, show_url, name):
+        """True if this run (or the one it resumes) already scraped the event cleanly"""
+        return (show_url, name) in self.completed
+    
+    def gave_up(self, show_url, name, max_attempts):
+        """True if the event has failed max_attempts times without succeeding"""
+        return not self.done(show_url, name) and self.failures[(show_url, name)] >= max_attempts
+    
+    def append(self, show_url, show_name, position, value, name, fights, error, seconds):
+        """Durably record one scraped event"""
+        record = {
+            'show_url': show_url,
+            'show': show_name,
+            'position': position,
+            'value': value,
+            'event': name,
+            'fights': fights,
+            'error': error,
+            'seconds': seconds,
+            'scraped_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.records.append(record)
+        if error:
+            self.failures[(show_url, name)] += 1
+        else:
+            self.completed.add((show_url, name))
+    
+    def failed(self):
+        """The last failed attempt of each event that hasn't succeeded"""
+        failed = {}
+        for r in self.records:
+            if r['error'] and not self.done(r['show_url'], r['event']):
+                failed[(r['show_url'], r['event'])] = r
+        return list(failed.values())
+    
+    def fights(self, shows):
+        """All journaled fights as {code: fight}, merged in show and dropdown
+        order, whatever order the events finished in (see merge_results)"""
+        show_order = {show_url: number for number, (show_url, show_name) in enumerate(shows)}
+        latest = {}
+        for r in self.records:
+            if not r['error'] and r['show_url'] in show_order:
+                latest[(r['show_url'], r['event'])] = r
+        ordered = sorted(latest.values(),
+                         key=lambda r: (show_order[r['show_url']], r.get('position', 0)))
+        items = [(index, r['show_url'], r['show'], r.get('position', 0), r['value'], r['event'])
+                 for index, r in enumerate(ordered)]
+        return merge_results(items, {index: r['fights'] for index, r in enumerate(ordered)})
+    
+    def close(self):
+        self.file.close()
     
+    def keep_failed(self):
+        """Drop everything but the failed attempts of events still to retry,
+        once the rest has been compacted into the database"""
+        self.close()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for r in self.records:
+                if r['error'] and not self.done(r['show_url'], r['event']):
+                    f.write(json.dumps(r, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+    
+    def remove(self):
+        """Delete the journal once its contents are safely compacted into the database"""
+        self.close()
+        os.remove(self.path)
+
+def write_database(fight_db, path=DB_PATH):
+    """Write the database atomically (temp file + rename), so readers such as
+    the app's hot reload never see a half-written file"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(fight_db, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def load_existing(path=DB_PATH):
+    """Existing database as {code: entry}, or {} if there is none yet"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return {entry['code']: entry for entry in json.load(f)}
+    except (OSError, ValueError):
+        return {}
+
+def scrape_serial(shows, skip=None, on_event=None):
+    """Scrape all shows one event at a time with a single driver.
+    Returns ({code: fight}, complete) like scrape_parallel.
+    """
     driver = setup_driver()
     all_fights = {}
-    
-    # Shows to scrape
-    shows = [
-        ('https://www.paramountplus.com/shows/ufc/', 'UFC (Numbered Events)'),
-        ('https://www.paramountplus.com/shows/ufc-fight-night/', 'UFC Fight Night'),
-        ('https://www.paramountplus.com/shows/ufc-2010s/', 'UFC 2010s'),
-        ('https://www.paramountplus.com/shows/ufc-2000s/', 'UFC 2000s'),
-    ]
+    complete = True
     
     for show_url, show_name in shows:
         try:
-            fights = scrape_show_page(driver, show_url, show_name)
+            fights = scrape_show_page(driver, show_url, show_name, skip, on_event)
             all_fights.update(fights)
             print(f"\n  Total unique fights so far: {len(all_fights)}")
         except Exception as e:
             print(f"\n  Error scraping {show_name}: {e}")
+            complete = False
             continue
     
     driver.quit()
+    print(f"\nPacing:\n{pacing_report()}")
+    return all_fights, complete
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape UFC fight video links from Paramount+")
+    parser.add_argument('--workers', type=int, default=4,
+                        help="number of browser processes scraping events in parallel (1 = serial)")
+    parser.add_argument('--incremental', action='store_true',
+                        help=f"skip events already captured in {MANIFEST_PATH} and merge into {DB_PATH}")
+    parser.add_argument('--settle-days', type=int, default=14,
+                        help="keep re-scraping events for this many days after they first appear")
+    parser.add_argument('--max-attempts', type=int, default=3,
+                        help="stop retrying an event after it has failed this many times in a row "
+                             "(counted across resumed runs) and leave it out")
+    parser.add_argument('--allow-partial', action='store_true',
+                        help="write the database from the events that were scraped even if others "
+                             "failed; the failures stay in the journal for the next run to retry")
+    args = parser.parse_args()
+    
+    print("UFC Paramount+ Fight Scraper")
+    print("="*60)
+    
+    # The manifest is written on every run so a later --incremental run can use it
+    manifest = Manifest(settle_days=args.settle_days)
+    journal = Journal()
+    if journal.records:
+        print(f"Resuming: {len(journal.records)} events already scraped in {JOURNAL_PATH}")
+    
+    # The previous database also tells the manifest which events are old
+    previous = load_existing()
+    known_codes = set(previous)
+    existing = {}
+    if args.incremental:
+        existing = previous
+        print(f"Incremental: {len(existing)} fights already in {DB_PATH}")
+    
+    def skip(show_url, name):
+        if journal.done(show_url, name) or journal.gave_up(show_url, name, args.max_attempts):
+            return True
+        return args.incremental and manifest.is_captured(show_url, name, known_codes)
     
-    # Build the final database
+    if args.workers > 1:
+        _, complete = scrape_parallel(SHOWS, args.workers, skip, journal.append)
+    else:
+        _, complete = scrape_serial(SHOWS, skip, journal.append)
+    
+    # Events that failed max_attempts times are left out. Any other failure
+    # means the database is only replaced with --allow-partial; otherwise the
+    # journal stays, and running again retries what is missing
+    failed = journal.failed()
+    retry = [r for r in failed if not journal.gave_up(r['show_url'], r['event'], args.max_attempts)]
+    for r in failed:
+        status = "Failed" if r in retry else f"Gave up after {args.max_attempts} attempts"
+        print(f"  {status}: {r['show']} / {r['event']}: {r['error']}")
+    partial = bool(retry) or not complete
+    if partial and not args.allow_partial:
+        journal.close()
+        print(f"\nScrape incomplete ({len(retry)} events failed"
+              f"{'' if complete else ', some never scraped'}); {DB_PATH} was not changed.")
+        print(f"Progress is kept in {JOURNAL_PATH}; run again to resume, "
+              f"or pass --allow-partial to save what was scraped.")
+        sys.exit(1)
+    if partial:
+        # Keep the previous entries for whatever wasn't scraped this time
+        existing = previous
+    
+    # Compact the journal into the database and manifest
+    all_fights = journal.fights(SHOWS)
+    for r in journal.records:
+        manifest.record(r['show_url'], r['show'], r['value'], r['event'], r['fights'],
+                        r['error'], r['seconds'], r['scraped_at'], known_codes)
+    
+    # Build the final database, on top of the existing one when incremental or partial
     fight_db = []
     for code, fight in all_fights.items():
         parsed = parse_fight_title(fight['title'])
@@ -285,18 +784,29 @@ def main():
             'card': parsed['card']
         }
         fight_db.append(entry)
+    if existing:
+        scraped = set(all_fights)
+        fight_db.extend(entry for code, entry in existing.items() if code not in scraped)
+        print(f"\nSkipped {manifest.skipped} captured events, "
+              f"{len(scraped - set(existing))} new fights")
     
     # Sort by event name
     fight_db.sort(key=lambda x: x['event'], reverse=True)
     
-    # Save to JSON file
-    with open('paramount_fights.json', 'w', encoding='utf-8') as f:
-        json.dump(fight_db, f, indent=2, ensure_ascii=False)
+    # Save to JSON file, then drop the journal it was built from (all but
+    # the failures still to retry, after a partial run)
+    write_database(fight_db)
+    manifest.save()
+    if partial:
+        journal.keep_failed()
+        print(f"\nPartial scrape saved; {len(retry)} failed events kept in {JOURNAL_PATH} for the next run")
+    else:
+        journal.remove()
     
     print(f"\n\n{'='*60}")
     print(f"SCRAPING COMPLETE!")
     print(f"Total fights found: {len(fight_db)}")
-    print(f"Saved to: paramount_fights.json")
+    print(f"Saved to: {DB_PATH}")
     print(f"{'='*60}")
     
     # Show some stats
@@ -0,0 +1,136 @@
+"""
+Request coalescing ("single-flight") for upstream fetches.
+When several threads ask for the same key at once, only the first one
+runs the fetch; every caller, the first one included, gets its own copy
+of the result. Coroutines can lead or join the same calls (do_async), so
+the threaded and asyncio paths share one fetch per key.
+"""
+import asyncio
+import copy
+import threading
+
+
+class Call:
+    """One in-flight fetch that other threads can wait on"""
+    __slots__ = ('done', 'result', 'error', 'futures')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.futures = []    # (event loop, future) of coroutines waiting on it
+
+
+class SingleFlight:
+    """Run at most one fetch per key at a time, sharing its result"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.stats = {'leaders': 0, 'coalesced': 0}
+
+    def do(self, key, fn):
+        """Return fn(), or the result of an identical call already running"""
+        call, leader = self.begin(key)
+        if not leader:
+            return self.wait(call)
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self.finish(key, call, error=e)
+            raise
+        self.finish(key, call, result)
+        return self.wait(call)
+
+    def do_if_idle(self, key, fn):
+        """Run fn() as the call for key, unless one is running already, in
+        which case return at once. For background loads that shouldn't wait
+        on a foreground one. Returns True if fn() ran.
+        """
+        call, leader = self.begin(key)
+        if not leader:
+            return False
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self.finish(key, call, error=e)
+            raise
+        self.finish(key, call, result)
+        return True
+
+    def begin(self, key):
+        """Join the call running for key, or start one. Returns (call, leader).
+        The leader must finish() it; the others wait() for it. do() does
+        both for a plain function; this is for results produced piecemeal.
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = Call()
+                self.stats['leaders'] += 1
+            else:
+                self.stats['coalesced'] += 1
+        return call, leader
+
+    def finish(self, key, call, result=None, error=None):
+        """Publish the leader's result (or error) and wake the waiting threads and coroutines"""
+        call.result = result
+        call.error = error
+        with self.lock:
+            del self.calls[key]
+            call.done.set()
+            futures = call.futures
+        for loop, future in futures:
+            try:
+                loop.call_soon_threadsafe(wake, future)
+            except RuntimeError:
+                pass    # that loop has been closed
+
+    @staticmethod
+    def wait(call):
+        """Wait for a call to finish and return a copy of its result.
+        call.result is shared by every caller, and callers may modify what
+        they get back (e.g. add Paramount+ links), so each gets its own copy.
+        """
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return copy.deepcopy(call.result)
+
+    async def do_async(self, key, fn):
+        """Coroutine version of do(): fn() returns an awaitable. The fetch
+        runs in its own task, so a cancelled leader doesn't fail the others.
+        """
+        call, leader = self.begin(key)
+        if leader:
+            await asyncio.shield(asyncio.ensure_future(self.lead(key, call, fn)))
+        return await self.wait_async(call)
+
+    async def lead(self, key, call, fn):
+        # Errors reach every caller, the leader included, through the call
+        try:
+            result = await fn()
+        except BaseException as e:
+            self.finish(key, call, error=e)
+            return
+        self.finish(key, call, result)
+
+    async def wait_async(self, call):
+        """wait() without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self.lock:
+            waiting = not call.done.is_set()
+            if waiting:
+                call.futures.append((loop, future))
+        if waiting:
+            await future
+        return self.wait(call)
+
+
+def wake(future):
+    if not future.done():
+        future.set_result(None)
@@ -12,6 +12,15 @@ const backBtn = document.getElementById('backBtn');
 
 let currentFighters = [];
 let searchTimeout = null;
+let searchController = null;
+let fightsController = null;
+
+// Recent autocomplete results, most recently used last. Kept for the
+// browser tab in sessionStorage so reloads don't start cold.
+const SEARCH_CACHE_KEY = 'fighterSearchCache';
+const SEARCH_CACHE_SIZE = 50;
+const SEARCH_CACHE_TTL = 5 * 60 * 1000;  // same as /api/search's max-age
+const searchCache = loadSearchCache();
 
 // Event Listeners
 searchInput.addEventListener('input', (e) => {
@@ -24,6 +33,7 @@ searchInput.addEventListener('input', (e) => {
     
     // If query is too short, hide autocomplete
     if (query.length < 2) {
+        cancelSearch();
         hideAutocomplete();
         return;
     }
@@ -42,6 +52,7 @@ document.addEventListener('click', (e) => {
 });
 
 backBtn.addEventListener('click', () => {
+    cancelFightsLoad();
     fightHistory.classList.add('hidden');
     searchInput.value = '';
     searchInput.focus();
@@ -52,18 +63,164 @@ backBtn.addEventListener('click', () => {
 async function searchFighterAutocomplete(query) {
     hideError();
     
+    const key = normalizeName(query);
+    const local = cachedSearch(key);
+    if (local) {
+        cancelSearch();
+        showAutocompleteResults(local.fighters);
+        return;
+    }
+    
+    // Only the newest query's response may update the dropdown
+    cancelSearch();
+    const controller = new AbortController();
+    searchController = controller;
+    
     try {
-        const response = await fetch(`/api/search?name=${encodeURIComponent(query)}`);
+        const response = await fetch(`/api/search?name=${encodeURIComponent(query)}`,
+                                     { signal: controller.signal });
         const data = await response.json();
         
-        if (data.fighters && data.fighters.length > 0) {
-            displayAutocomplete(data.fighters);
-        } else {
+        // Only real results are kept; an upstream failure (502) is shown, not cached
+        if (!response.ok) {
             hideAutocomplete();
+            if (data.error) {
+                showError(data.error);
+            }
+            return;
         }
+        cacheSearch(key, { fighters: data.fighters || [], complete: Boolean(data.complete) });
+        showAutocompleteResults(data.fighters);
     } catch (error) {
+        if (error.name === 'AbortError') {
+            return;
+        }
         console.error('Autocomplete error:', error);
         hideAutocomplete();
+    } finally {
+        if (searchController === controller) {
+            searchController = null;
+        }
+    }
+}
+
+// Abort the autocomplete request in flight, if any
+function cancelSearch() {
+    if (searchController) {
+        searchController.abort();
+        searchController = null;
+    }
+}
+
+function showAutocompleteResults(fighters) {
+    if (fighters && fighters.length > 0) {
+        displayAutocomplete(fighters);
+    } else {
+        hideAutocomplete();
+    }
+}
+
+// Results for a query without asking the server: an earlier identical
+// query, or the complete results of a shorter query it extends, narrowed
+// and ranked the way the fighter directory does it
+function cachedSearch(key) {
+    const exact = searchCacheGet(key);
+    if (exact) {
+        return exact;
+    }
+    
+    const tokens = key.split(' ').filter(Boolean);
+    for (let length = key.length - 1; length >= 2; length--) {
+        const prefix = searchCacheGet(key.slice(0, length));
+        if (!prefix || !prefix.complete) {
+            continue;
+        }
+        const fighters = rankFighters(prefix.fighters.filter((f) => matchesTokens(f, tokens)), key, tokens);
+        // No prefix matches means the server would fall back to fuzzy matching
+        if (fighters.length === 0) {
+            return null;
+        }
+        const entry = { fighters, complete: true };
+        cacheSearch(key, entry);
+        return entry;
+    }
+    return null;
+}
+
+// Same as names.normalize on the server: lowercase, accents folded, only a-z, 0-9 and spaces
+const EXTRA_LETTERS = { 'ø': 'o', 'đ': 'd', 'ð': 'd', 'ł': 'l', 'ħ': 'h', 'ı': 'i',
+                        'ß': 'ss', 'æ': 'ae', 'œ': 'oe', 'þ': 'th' };
+
+function normalizeName(name) {
+    return name.toLowerCase().trim()
+        .replace(/[øđðłħıßæœþ]/g, (ch) => EXTRA_LETTERS[ch])
+        .normalize('NFKD')
+        .replace(/[^a-z0-9 ]/g, '');
+}
+
+// Every query token starts some word of the fighter's name or nickname
+function matchesTokens(fighter, tokens) {
+    const words = `${normalizeName(fighter.name)} ${normalizeName(fighter.nickname || '')}`
+        .split(' ').filter(Boolean);
+    return tokens.every((token) => words.some((word) => word.startsWith(token)));
+}
+
+// Order as DirectoryIndex.rank: exact name, name prefix, last-name prefix, most fights, name
+function rankFighters(fighters, query, tokens) {
+    const lastToken = tokens[tokens.length - 1];
+    const keyed = fighters.map((fighter) => {
+        const name = normalizeName(fighter.name);
+        const total = fighter.record.split('-')
+            .reduce((sum, n) => sum + (/^\d+$/.test(n) ? Number(n) : 0), 0);
+        return {
+            fighter,
+            key: [name !== query, !name.startsWith(query),
+                  !normalizeName(fighter.last || '').startsWith(lastToken), -total, name]
+        };
+    });
+    keyed.sort((a, b) => {
+        for (let i = 0; i < a.key.length; i++) {
+            if (a.key[i] < b.key[i]) return -1;
+            if (a.key[i] > b.key[i]) return 1;
+        }
+        return 0;
+    });
+    return keyed.map((item) => item.fighter);
+}
+
+function loadSearchCache() {
+    try {
+        return new Map(JSON.parse(sessionStorage.getItem(SEARCH_CACHE_KEY)) || []);
+    } catch (error) {
+        return new Map();
+    }
+}
+
+function searchCacheGet(key) {
+    const entry = searchCache.get(key);
+    if (!entry) {
+        return null;
+    }
+    if (Date.now() - entry.time > SEARCH_CACHE_TTL) {
+        searchCache.delete(key);
+        return null;
+    }
+    // Move to the most recently used end
+    searchCache.delete(key);
+    searchCache.set(key, entry);
+    return entry;
+}
+
+function cacheSearch(key, entry) {
+    searchCache.delete(key);
+    searchCache.set(key, { ...entry, time: Date.now() });
+    while (searchCache.size > SEARCH_CACHE_SIZE) {
+        searchCache.delete(searchCache.keys().next().value);
+    }
+    try {
+        sessionStorage.setItem(SEARCH_CACHE_KEY, JSON.stringify([...searchCache]));
+    } catch (error) {
+        // Storage full or unavailable: the in-memory cache still works
     }
 }
 
@@ -120,67 +277,134 @@ function displayFighters(fighters) {
     fighterResults.classList.remove('hidden');
 }
 
-// Load fights for a specific fighter
+// Load fights for a specific fighter, showing each one as soon as it arrives
 async function loadFighterFights(fighter) {
     showLoading();
     hideSections();
     hideError();
     
+    // Picking another fighter stops this one loading
+    cancelFightsLoad();
+    const controller = new AbortController();
+    fightsController = controller;
+    
+    let count = 0;
+    let finished = false;
     try {
-        const response = await fetch(`/api/fights?url=${encodeURIComponent(fighter.url)}&name=${encodeURIComponent(fighter.name)}`);
-        const data = await response.json();
+        const response = await fetch(`/api/fights/stream?url=${encodeURIComponent(fighter.url)}&name=${encodeURIComponent(fighter.name)}`,
+                                     { signal: controller.signal });
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}`);
+        }
         
-        hideLoading();
+        fighterName.textContent = `${fighter.name}'s Fight History`;
+        fightList.innerHTML = '';
         
-        if (data.fights && data.fights.length > 0) {
-            displayFights(data.fights, fighter);
-        } else {
+        for await (const message of readNdjson(response.body)) {
+            if (message.error) {
+                throw new Error(message.error);
+            }
+            if (message.fight) {
+                if (count === 0) {
+                    hideLoading();
+                    fightHistory.classList.remove('hidden');
+                }
+                fightList.appendChild(createFightCard(message.fight, fighter));
+                count++;
+            } else if ('count' in message) {
+                finished = true;
+            }
+        }
+        if (!finished) {
+            throw new Error('Fight history ended early');
+        }
+        
+        hideLoading();
+        if (count === 0) {
             showError('No fight history found for this fighter.');
         }
     } catch (error) {
+        if (error.name === 'AbortError') {
+            return;
+        }
         hideLoading();
-        showError('Error loading fight history. Please try again.');
+        showError(count > 0
+            ? 'Only part of the fight history could be loaded. Please try again.'
+            : 'Error loading fight history. Please try again.');
         console.error('Fight loading error:', error);
+    } finally {
+        if (fightsController === controller) {
+            fightsController = null;
+        }
     }
 }
 
-// Display fight history
-function displayFights(fights, fighter) {
-    fighterName.textContent = `${fighter.name}'s Fight History`;
-    fightList.innerHTML = '';
-    
-    fights.forEach((fight) => {
-        const card = document.createElement('div');
-        const available = fight.paramount_available;
-        card.className = 'fight-card' + (available ? '' : ' fight-unavailable');
-        
-        const availabilityBadge = available
-            ? '<span class="badge-available">▶ Watch on Paramount+</span>'
-            : '<span class="badge-unavailable">Not Available</span>';
-        
-        card.innerHTML = `
-            <div class="fight-header">
-                <div class="fight-event">${fight.event}</div>
-                <div class="fight-status">${availabilityBadge}</div>
-            </div>
-            <div class="fight-details">
-                <div class="fight-opponent">vs ${fight.opponent}</div>
-                <div class="fight-date">${fight.date}</div>
-            </div>
-        `;
-        
-        if (available) {
-            card.addEventListener('click', () => openParamountLink(fight, fighter.name));
+function cancelFightsLoad() {
+    if (fightsController) {
+        fightsController.abort();
+        fightsController = null;
+    }
+}
+
+// Parse a newline-delimited JSON body line by line as it streams in
+async function* readNdjson(body) {
+    const reader = body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffered = '';
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) {
+            break;
         }
-        
-        fightList.appendChild(card);
-    });
+        buffered += value;
+        const lines = buffered.split('\n');
+        buffered = lines.pop();
+        for (const line of lines) {
+            if (line.trim()) {
+                yield JSON.parse(line);
+            }
+        }
+    }
+    if (buffered.trim()) {
+        yield JSON.parse(buffered);
+    }
+}
+
+// Build the card for one fight
+function createFightCard(fight, fighter) {
+    const card = document.createElement('div');
+    const available = fight.paramount_available;
+    card.className = 'fight-card' + (available ? '' : ' fight-unavailable');
+    
+    const availabilityBadge = available
+        ? '<span class="badge-available">▶ Watch on Paramount+</span>'
+        : '<span class="badge-unavailable">Not Available</span>';
+    
+    card.innerHTML = `
+        <div class="fight-header">
+            <div class="fight-event">${fight.event}</div>
+            <div class="fight-status">${availabilityBadge}</div>
+        </div>
+        <div class="fight-details">
+            <div class="fight-opponent">vs ${fight.opponent}</div>
+            <div class="fight-date">${fight.date}</div>
+        </div>
+    `;
     
-    fightHistory.classList.remove('hidden');
+    if (available) {
+        card.addEventListener('click', () => openParamountLink(fight, fighter.name));
+    }
+    
+    return card;
 }
 
 // Open Paramount+ link for the fight
 async function openParamountLink(fight, fighterName) {
+    // /api/fights already resolved the direct link
+    if (fight.paramount_url) {
+        window.open(fight.paramount_url, '_blank');
+        return;
+    }
+    
     try {
         // Ask the backend to find the direct Paramount+ video URL
         const params = new URLSearchParams({